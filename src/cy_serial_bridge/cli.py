@@ -86,9 +86,9 @@ class GlobalOptions:
 global_opt: GlobalOptions = cast(GlobalOptions, None)
 
 
-# Global context instance.
+# Global context instance, created by the global callback (same as global_opt).
 # Fine to use a global one since the CLI can only talk to one device at a time.
-context = cy_serial_bridge.CyScbContext()
+context: cy_serial_bridge.CyScbContext = cast(cy_serial_bridge.CyScbContext, None)
 
 
 @app.callback()
@@ -104,8 +104,11 @@ def handle_global_options(
     logging.basicConfig(level=log_level)
     log.setLevel(log_level)
 
-    # Also set libusb log level based on 'verbose'
-    context.usb_context.setDebug(usb1.LOG_LEVEL_INFO if verbose else usb1.LOG_LEVEL_ERROR)
+    # Also set libusb log level based on 'verbose'.
+    # Passing it to the constructor (instead of calling setDebug() here) means the libusb context is still only
+    # created once a command needs it.
+    global context  # noqa: PLW0603
+    context = cy_serial_bridge.CyScbContext(log_level=usb1.LOG_LEVEL_INFO if verbose else usb1.LOG_LEVEL_ERROR)
 
     # Save other options
     global global_opt  # noqa: PLW0603
@@ -1,6 +1,14 @@
 from __future__ import annotations
 
+import concurrent.futures
+import contextlib
+import dataclasses
+import functools
+import itertools
+import os
+import pathlib
 import sys
+import threading
 import time
 import typing
 from enum import Enum
@@ -36,6 +44,18 @@ class OpenMode(Enum):
     UART_CDC = (CyType.UART_CDC, serial.Serial)
 
 
+# Possible (address, transfer type) pairs of the three endpoints of an SCB interface, flattened into one tuple.
+# SCB0 uses endpoints 0x01, 0x82, and 0x83, and SCB1 uses 0x04, 0x85, and 0x86.
+_SCB_ENDPOINT_LAYOUTS = frozenset(
+    (bulk_out_addr, 2, bulk_in_addr, 2, int_in_addr, 3)
+    for bulk_out_addr, bulk_in_addr, int_in_addr in itertools.product((0x01, 0x04), (0x82, 0x85), (0x83, 0x86))
+)
+
+# Interface subclasses used by the vendor-class interfaces of a CY7C652xx, as plain ints
+_MFG_SUBCLASS = CyType.MFG.value
+_SCB_SUBCLASSES = frozenset({CyType.UART_VENDOR.value, CyType.SPI.value, CyType.I2C.value, CyType.JTAG.value})
+_SUBCLASS_TO_CYTYPE = {subclass: CyType(subclass) for subclass in _SCB_SUBCLASSES}
+
 # Type annotation for anything that can be returned by
 AnyDriverClass = Union[driver.CySPIControllerBridge, driver.CyI2CControllerBridge, driver.CyMfgrIface, serial.Serial]
 
@@ -50,11 +70,63 @@ class CyScbContext:
         on it at a time.
     """
 
-    def __init__(self) -> None:
-        self.usb_context = usb1.USBContext()
-        self.usb_context.open()
+    def __init__(self, log_level: int | None = None) -> None:
+        """
+        :param log_level: libusb log level (one of the usb1.LOG_LEVEL_xxx constants) to set once the libusb context
+            has been created.  If None, libusb's default (or the LIBUSB_DEBUG environment variable) is used.
+        """
+        # libusb context is created on first use, as initializing libusb can take a while on some platforms
+        self._log_level = log_level
+        self._usb_context: usb1.USBContext | None = None
         self.has_opened_driver = False
 
+        # Set when a device has been reset and we expect it to re-enumerate.  On Windows, libusb needs its context
+        # to be reopened to reliably see re-enumerated devices, but doing that is slow, so we only do it when needed.
+        self._needs_win_reset = False
+
+        # Cache of serial number -> (lookup time, serial port name), since listing serial ports is slow on some
+        # platforms (WMI queries on Windows).  Only successful lookups are cached.
+        self._serno_cache: dict[str, tuple[float, str]] = {}
+
+        # Result of the last list_devices() call, as (scan time, cache key, device list)
+        self._list_cache: tuple[float, object, list[DiscoveredDevice]] | None = None
+
+    @property
+    def usb_context(self) -> usb1.USBContext:
+        """
+        The libusb context used by this driver context.  It is created and opened the first time it is accessed.
+        """
+        if self._usb_context is None:
+            # Note: the log level is not passed to the USBContext constructor, as python-libusb1 turns that into an
+            # option for libusb_init_context(), which is not supported by libusb versions older than 1.0.27
+            usb_context = usb1.USBContext()
+            usb_context.open()
+            if self._log_level is not None:
+                usb_context.setDebug(self._log_level)
+            self._usb_context = usb_context
+        return self._usb_context
+
+    # How long the result of list_devices() may be reused if the devices on the bus have not changed
+    LIST_CACHE_TTL = 0.05  # s
+
+    # How long a cached serial port name stays valid.  Kept well below CHANGE_TYPE_TIMEOUT.
+    SERIAL_PORT_CACHE_TTL = 2.0  # s
+
+    def _lookup_serial_port_name(self, serial_number: str) -> str | None:
+        """
+        Find the serial port name for a device with the given serial number, using the cache if possible.
+        """
+        cache_entry = self._serno_cache.get(serial_number)
+        if cache_entry is not None and time.monotonic() - cache_entry[0] < self.SERIAL_PORT_CACHE_TTL:
+            return cache_entry[1]
+
+        serial_port_name = self._find_serial_port_name_for_serno(serial_number)
+        if serial_port_name is None:
+            self._serno_cache.pop(serial_number, None)
+        else:
+            self._serno_cache[serial_number] = (time.monotonic(), serial_port_name)
+        return serial_port_name
+
     @staticmethod
     def _find_serial_port_name_for_serno(serial_number: str) -> str | None:
         """
@@ -72,66 +144,150 @@ class CyScbContext:
 
         return None
 
+    # Maximum number of devices whose string descriptors are read in parallel by list_devices()
+    MAX_STRING_READ_THREADS = 8
+
+    @classmethod
+    def _populate_strings(
+        cls,
+        list_entry: DiscoveredDevice,
+        need_strings: bool,
+        string_cache: dict[tuple[int, int, int], str | None],
+        string_cache_lock: threading.Lock,
+    ) -> None:
+        """
+        Fill in the string descriptors of a discovered device, and set open_failed if it cannot be opened.
+
+        If need_strings is False, only checks whether the device can be opened.
+        Manufacturer and product strings are shared between devices of the same model, so they are stored in
+        string_cache, keyed on (vid, pid, string index), and only read from the first device of each model.
+        As this may be called from several threads at once, string_cache must only be accessed with
+        string_cache_lock held.
+        """
+        if sys.platform.startswith("linux") and cls._read_strings_from_sysfs(list_entry):
+            return
+
+        try:
+            # Close the handle as soon as we are done with it.  Leaked handles hold OS resources, and on Windows
+            # they can make later scans see stale devices.
+            with contextlib.closing(list_entry.usb_device.open()) as opened_device:
+                if need_strings:
+
+                    def read_shared_string(index: int) -> str | None:
+                        cache_key = (list_entry.vid, list_entry.pid, index)
+                        with string_cache_lock:
+                            if cache_key in string_cache:
+                                return string_cache[cache_key]
+
+                        # Don't hold the lock over the USB transfer.  At worst, two threads read the same string.
+                        string = opened_device.getASCIIStringDescriptor(index)
+                        with string_cache_lock:
+                            return string_cache.setdefault(cache_key, string)
+
+                    list_entry.manufacturer_str = read_shared_string(list_entry.usb_device.getManufacturerDescriptor())
+                    list_entry.product_str = read_shared_string(list_entry.usb_device.getProductDescriptor())
+                    list_entry.serial_number = opened_device.getSerialNumber()
+        except usb1.USBError:
+            list_entry.open_failed = True
+
+    @staticmethod
+    def _read_strings_from_sysfs(list_entry: DiscoveredDevice) -> bool:
+        """
+        On Linux, fill in the string descriptors of a discovered device from sysfs.
+
+        The kernel has already read these strings from the device, so this saves opening the device and doing
+        three control transfers.  The device is flagged as open_failed if its device node cannot be opened for
+        reading and writing (which is what libusb does when opening it) due to a lack of permissions.
+        Returns False if the sysfs entry or device node could not be read for any other reason (e.g. because the
+        device was just unplugged), in which case the caller should use libusb instead.
+        """
+        dev = list_entry.usb_device
+        port_numbers = dev.getPortNumberList()
+        if len(port_numbers) == 0:
+            return False
+
+        sysfs_dir = pathlib.Path("/sys/bus/usb/devices") / (
+            f"{dev.getBusNumber()}-" + ".".join(str(port) for port in port_numbers)
+        )
+
+        def read_attribute(name: str) -> str | None:
+            try:
+                return (sysfs_dir / name).read_text().strip()
+            except FileNotFoundError:
+                # Attribute is missing if the device does not have that string descriptor
+                return None
+
+        try:
+            if int((sysfs_dir / "devnum").read_text()) != dev.getDeviceAddress():
+                # Stale sysfs entry, device must have re-enumerated
+                return False
+
+            # Actually open the device node rather than checking its mode bits, so that ACLs and capabilities are
+            # taken into account the same way as when libusb opens it
+            device_node = f"/dev/bus/usb/{dev.getBusNumber():03}/{dev.getDeviceAddress():03}"
+            try:
+                os.close(os.open(device_node, os.O_RDWR))
+            except PermissionError:
+                list_entry.open_failed = True
+                return True
+
+            manufacturer_str = read_attribute("manufacturer")
+            product_str = read_attribute("product")
+            serial_number = read_attribute("serial")
+        except (OSError, ValueError):
+            return False
 
+        list_entry.manufacturer_str = manufacturer_str
+        list_entry.product_str = product_str
+        list_entry.serial_number = serial_number
+        return True
 
-    def identify_interface(self, intf: usb1.USBInterface) -> CyType|None:
+    @staticmethod
+    def identify_interface(intf: usb1.USBInterface) -> CyType|None:
         """
         Identify the current interface of a device.
 
         This is useful for determining the current mode of a device, as the interface is the only part of the device
         that can be queried without opening it.
         """
-        if intf[0].getClass() == USBClass.CDC:
-            if intf[0].getSubClass() == 0x2:
+        # Read the class and subclass once, each read goes through ctypes
+        setting = intf[0]
+        intf_class = setting.getClass()
+        intf_subclass = setting.getSubClass()
+
+        if intf_class == USBClass.CDC:
+            if intf_subclass == 0x2:
                 return CyType.UART_CDC
-            # elif intf[0].getSubClass() == ??
+            # elif intf_subclass == ??
             #     return CyType.SPI_CDC
-        elif intf[0].getClass() == 0x0A:
-            if intf[0].getSubClass() == 0x0:
+        elif intf_class == 0x0A:
+            if intf_subclass == 0x0:
                 return CyType.CDC_DATA
-        elif intf[0].getClass() == 0xFF:
-            # Check manufacturer interface.
-            # It has a defined class/subclass and has no endpoints
-            if intf[0].getNumEndpoints() != 0:
-                return None
-            if intf[0].getSubClass() == CyType.MFG:
-                return CyType.MFG
-        elif intf[0].getClass() == USBClass.VENDOR:
-                if intf[0].getSubClass() not in {
-                    CyType.UART_VENDOR.value,
-                    CyType.SPI.value,
-                    CyType.I2C.value,
-                    CyType.JTAG.value,
-                }:
-                    return None
-                if intf[0].getNumEndpoints() != 3:
-                    return None
-                # Bulk host-to-dev endpoint
-                if (
-                    not (intf[0].getAddress() in [0x01, 0x04])
-                    or (intf[0].getAttributes() & 0x3) != 2
-                ):
-                    return None
-                # Bulk dev-to-host endpoint
-                if (
-                    not (intf[1].getAddress() in [0x82, 0x85])
-                    or (intf[1].getAttributes() & 0x3) != 2
-                ):
-                    return None
-                # Interrupt dev-to-host endpoint
-                if (
-                    not (intf[2].getAddress() in [0x83, 0x86])
-                    or (intf[2].getAttributes() & 0x3) != 3
-                ):
+        elif intf_class == USBClass.VENDOR:
+            if intf_subclass == _MFG_SUBCLASS:
+                # Check manufacturer interface.
+                # It has a defined class/subclass and has no endpoints
+                if setting.getNumEndpoints() != 0:
                     return None
-                return CyType(intf[0].getSubClass())
-        return None
-
+                return CyType.MFG
 
+            if intf_subclass not in _SCB_SUBCLASSES:
+                return None
+            # Check the bulk host-to-dev, bulk dev-to-host, and interrupt dev-to-host endpoints all in one go.
+            # Each endpoint object is fetched once, and a wrong number of endpoints can never match.
+            endpoint_layout = tuple(
+                field for endpoint in setting for field in (endpoint.getAddress(), endpoint.getAttributes() & 0x3)
+            )
+            if endpoint_layout not in _SCB_ENDPOINT_LAYOUTS:
+                return None
+            return _SUBCLASS_TO_CYTYPE[intf_subclass]
+        return None
 
     def list_devices(
         self,
         vid_pids: Set[tuple[int, int]] | None = DEFAULT_VIDS_PIDS,
+        need_strings: bool = True,
+        serial_filter: str | None = None,
     ) -> list[DiscoveredDevice]:
         """
         Scan for USB devices which look like they could be CY6C652xx chips based on their USB descriptor layout.
@@ -142,99 +298,99 @@ class CyScbContext:
 
         Note: For each PID value, both the even value (pid & 0xFFFE) and the odd value ((pid & 0xFFFE) + 1)
         will be considered.  This is to support UART CDC mode (see the README)
+
+        If need_strings is False, the manufacturer, product and serial number strings (and the serial port name)
+        may be left as None.  Devices are still opened to check whether open_failed should be set, but no string
+        descriptors are requested from them, which saves three control transfers per device.
+
+        If serial_filter is given, devices which can be opened but have a different serial number are left out,
+        and the scan stops at the first device with a matching serial number.  Devices which could not be opened
+        are still returned.  Setting serial_filter implies need_strings.
         """
+        if serial_filter is not None:
+            need_strings = True
+
         device_list: list[DiscoveredDevice] = []
 
         # In my testing, on Windows, this is needed in order to correctly detect re-enumerated devices
         # in some cases.  Seems to be some sort of libusb bug...
-        if sys.platform == "win32":
+        # However, reopening the context can take hundreds of ms, so only do it while we are waiting for a device
+        # to re-enumerate.
+        if sys.platform == "win32" and self._needs_win_reset:
             self.usb_context.close()
             self.usb_context.open()
+            if self._log_level is not None:
+                self.usb_context.setDebug(self._log_level)
+
+        # Note: python-libusb1 reads each device's config descriptors when it creates the USBDevice, so devices
+        # whose descriptors cannot be read have to be skipped here, before we ever see their VID and PID.
+        usb_devices: list[usb1.USBDevice] = self.usb_context.getDeviceList(skip_on_error=True)
+
+        # If the set of devices on the bus has not changed since a very recent identical scan, reuse its result.
+        # Devices get a new address whenever they re-enumerate, so the key changes if a device was reset.
+        cache_key = (
+            None if vid_pids is None else frozenset(vid_pids),
+            need_strings,
+            serial_filter,
+            frozenset(
+                (dev.getBusNumber(), dev.getDeviceAddress(), dev.getVendorID(), dev.getProductID())
+                for dev in usb_devices
+            ),
+        )
+        if (
+            not self._needs_win_reset
+            and self._list_cache is not None
+            and self._list_cache[1] == cache_key
+            and time.monotonic() - self._list_cache[0] < self.LIST_CACHE_TTL
+        ):
+            # DiscoveredDevice is mutable, so hand out copies to keep callers from changing the cached entries
+            return [dataclasses.replace(list_entry) for list_entry in self._list_cache[2]]
 
-        dev: usb1.USBDevice
-        for dev in self.usb_context.getDeviceIterator(skip_on_error=True):
-            even_vid_pid = (dev.getVendorID(), dev.getProductID() & 0xFFFE)
-            odd_vid_pid = (dev.getVendorID(), (dev.getProductID() & 0xFFFE) + 1)
-
-            if vid_pids is not None and even_vid_pid not in vid_pids and odd_vid_pid not in vid_pids:
-                # Not a VID-PID we're looking for
-                continue
-
-            # CY7C652xx devices always have one configuration
-            if len(dev) != 1:
-                continue
-            cfg: usb1.USBConfiguration = dev[0]
-
-            # CY7C652xx devices always have either two or three interfaces: potentially one for the USB CDC COM port,
-            # one for the actual USB-serial bridge, and one for the configuration interface.
-            # CY7C65215 and CY7C65215A devices have (up to?) 4 interfaces.
-            # CY7C65215 devices could have 0-2 CDC interfaces, up to one on each SCB
-            if cfg.getNumInterfaces() != 2 and cfg.getNumInterfaces() != 3 and cfg.getNumInterfaces() != 4:
-                continue
-
-            usb_cdc_interface_settings: usb1.USBInterfaceSetting | None = None
-            cdc_data_interface_settings: usb1.USBInterfaceSetting | None = None
-            scb_interface_settings: usb1.USBInterfaceSetting | None = None
-            mfg_interface_settings: usb1.USBInterfaceSetting
-
-            for i in range(cfg.getNumInterfaces()):
-                type = self.identify_interface(cfg[i])
-                if type == None:
-                    pass # TODO verbose output
-                else:
-                    match(type):
-                        case CyType.UART_CDC: # TODO we could have two of these!
-                            usb_cdc_interface_settings = cfg[i][0]
-                            curr_cytype = CyType.UART_CDC
-                        case CyType.CDC_DATA:
-                            cdc_data_interface_settings = cfg[i][0]
-                        case CyType.MFG:
-                            mfg_interface_settings = cfg[i][0]
-                        case CyType.I2C: # TODO we could have two of these!
-                            scb_interface_settings = cfg[i][0]
-                            curr_cytype = CyType.I2C
-                        case CyType.SPI:
-                            scb_interface_settings = cfg[i][0]
-                            curr_cytype = CyType.SPI
-                        case CyType.JTAG:
-                            scb_interface_settings = cfg[i][0]
-                            curr_cytype = CyType.JTAG
-                        case CyType.UART_VENDOR:
-                            scb_interface_settings = cfg[i][0]
-                            curr_cytype = CyType.UART_VENDOR
-
-            if curr_cytype is None or mfg_interface_settings is None \
-                or (scb_interface_settings is None and usb_cdc_interface_settings is None):
-                # TODO verbose output
-                continue
+        valid_vids = None if vid_pids is None else frozenset(vid for vid, _ in vid_pids)
 
-            if mfg_interface_settings is not None: curr_cytype = CyType.MFG
-
-            # If we got all the way here, it looks like a CY6C652xx device!
-            # Record attributes and add it to the list
-            list_entry = DiscoveredDevice(
-                usb_device=dev,
-                usb_configuration=cfg,
-                mfg_interface_settings=mfg_interface_settings,
-                scb_interface_settings=scb_interface_settings,
-                usb_cdc_interface_settings=usb_cdc_interface_settings,
-                cdc_data_interface_settings=cdc_data_interface_settings,
-                vid=dev.getVendorID(),
-                pid=dev.getProductID(),
-                curr_cytype=curr_cytype,
-                open_failed=False,
-            )
+        dev: usb1.USBDevice
+        for dev in usb_devices:
             try:
-                opened_device = dev.open()
-                list_entry.manufacturer_str = opened_device.getManufacturer()
-                list_entry.product_str = opened_device.getProduct()
-                list_entry.serial_number = opened_device.getSerialNumber()
+                list_entry = _filter_and_describe(dev, vid_pids, valid_vids)
             except usb1.USBError:
-                list_entry.open_failed = True
+                # Device went away or has broken descriptors, it can't be one of ours anyway
+                continue
+            if list_entry is not None:
+                device_list.append(list_entry)
+
+        # Reading string descriptors takes a few control transfers per device, so if there are several devices,
+        # talk to them in parallel.  libusb releases the GIL while waiting for transfers.
+        # If we are looking for one serial number, go one at a time instead so we can stop as soon as we find it.
+        string_cache: dict[tuple[int, int, int], str | None] = {}
+        string_cache_lock = threading.Lock()
+        if serial_filter is not None:
+            candidates = device_list
+            device_list = []
+            for list_entry in candidates:
+                self._populate_strings(list_entry, need_strings, string_cache, string_cache_lock)
+                if list_entry.open_failed:
+                    device_list.append(list_entry)
+                elif list_entry.serial_number == serial_filter:
+                    device_list.append(list_entry)
+                    break
+        elif len(device_list) > 1 and not sys.platform.startswith("linux"):
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=min(self.MAX_STRING_READ_THREADS, len(device_list))
+            ) as executor:
+                list(
+                    executor.map(
+                        lambda entry: self._populate_strings(entry, need_strings, string_cache, string_cache_lock),
+                        device_list,
+                    )
+                )
+        else:
+            for list_entry in device_list:
+                self._populate_strings(list_entry, need_strings, string_cache, string_cache_lock)
 
+        for list_entry in device_list:
             # Iff this is a CDC serial device, find its associated COM port.
             # Luckily, pyserial does the hard work of talking to the OS for us here.
-            if curr_cytype == CyType.UART_CDC and not list_entry.open_failed:
+            if need_strings and list_entry.curr_cytype == CyType.UART_CDC and not list_entry.open_failed:
                 if list_entry.serial_number is None:
                     log.warning(
                         "Discovered CY7C652xx device in UART mode with no serial number configured.  Will "
@@ -242,16 +398,34 @@ class CyScbContext:
                         "serial number."
                     )
                 else:
-                    list_entry.serial_port_name = self._find_serial_port_name_for_serno(list_entry.serial_number)
-
-            device_list.append(list_entry)
+                    list_entry.serial_port_name = self._lookup_serial_port_name(list_entry.serial_number)
 
+        self._list_cache = (
+            time.monotonic(),
+            cache_key,
+            [dataclasses.replace(list_entry) for list_entry in device_list],
+        )
         return device_list
 
+    @staticmethod
+    def _normalize_pids(pids: Union[int, set[int]]) -> set[int]:
+        """
+        Convert a pids argument, which may be a single integer or a set of integers, into a new set.
+
+        A copy is always returned, so the caller's set is never shared with (or modified through) the result.
+        """
+        if isinstance(pids, int):
+            return {pids}
+        return set(pids)
+
     # Time we allow for the device to change its type and be enumerated on the USB bus:
     # It can take quite some time for the OS to re-enumerate the serial port
     CHANGE_TYPE_TIMEOUT = 10.0  # s
 
+    # Bounds for the interval at which we rescan the bus while waiting for a device to change type
+    CHANGE_TYPE_MIN_POLL_INTERVAL = 0.01  # s
+    CHANGE_TYPE_MAX_POLL_INTERVAL = 0.1  # s
+
     def scan_for_device(
         self, vid: int, pids: Union[int, set[int]], open_mode: OpenMode, serial_number: str | None = None
     ) -> DiscoveredDevice:
@@ -265,19 +439,55 @@ class CyScbContext:
         :param pids: Product IDs of the device you want to open.  Accepts either a single integer or a set of ints
         :param serial_number: Serial number of the device you want to open.  May be left as None if there is only one device attached.
         """
-        if type(pids) is int:
-            pids = {pids}
+        pids = self._normalize_pids(pids)
+        device_to_open, message = self._try_scan_for_device(vid, pids, open_mode, serial_number)
+        if device_to_open is None:
+            if message is None:
+                message = "No devices found"
+                if serial_number is not None:
+                    # Devices with the wrong serial number were filtered out.  Figure out if there were any, so that
+                    # we can give a useful error.  This costs another descriptor walk, so it is only done here, on the
+                    # error path, and not in the polling loops which use _try_scan_for_device() directly.
+                    devices_with_other_serno = len(
+                        self.list_devices(_vid_pid_filter(vid, frozenset(pids)), need_strings=False)
+                    )
+                    if devices_with_other_serno == 1:
+                        message = "The only detected device does not have a matching serial number!"
+                    elif devices_with_other_serno > 1:
+                        message = "Multiple devices found but none matched the specified serial number!"
+            raise CySerialBridgeError(message)
+        return device_to_open
+
+    def scan_for_device_or_none(
+        self, vid: int, pids: Union[int, set[int]], open_mode: OpenMode, serial_number: str | None = None
+    ) -> DiscoveredDevice | None:
+        """
+        Same as scan_for_device(), but returns None instead of raising an exception if no suitable
+        device can be found.
+        """
+        return self._try_scan_for_device(vid, self._normalize_pids(pids), open_mode, serial_number)[0]
 
-        # pids will always be a set[int] at this point but mypy can't seem to figure that out
-        pids = cast(set[int], pids)
+    def _try_scan_for_device(
+        self, vid: int, pids: set[int], open_mode: OpenMode, serial_number: str | None
+    ) -> tuple[DiscoveredDevice | None, str | None]:
+        """
+        Implementation of scan_for_device().
 
-        devices = self.list_devices({(vid, pid) for pid in pids})
+        Returns a tuple of (device, None) if a device was found, or (None, error message) if not.
+        If no matching devices were found at all, returns (None, None).
+        Does not raise, so that it can be used cheaply in retry loops.
+        """
+        # We only need the string descriptors if we have to match a serial number, or to find the
+        # serial port of a CDC device
+        need_strings = serial_number is not None or open_mode == OpenMode.UART_CDC
+        vid_pids = _vid_pid_filter(vid, frozenset(pids))
+        devices = self.list_devices(vid_pids, need_strings=need_strings, serial_filter=serial_number)
 
         # print("Scan results:" + str(devices))
 
         if len(devices) == 0:
-            message = "No devices found"
-            raise CySerialBridgeError(message)
+            # Leave it to the caller to work out a more detailed message, if it needs one
+            return None, None
         elif len(devices) == 1:
             # Exactly 1 device found
             device_to_open = devices[0]
@@ -286,36 +496,32 @@ class CyScbContext:
                 message = f"Found device with VID:PID {vid:04x}:{device_to_open.pid:04x} but cannot open it!"
                 if sys.platform == "win32":
                     message += "  This is likely because it does not have the WinUSB driver attached."
-                raise CySerialBridgeError(message)
+                return None, message
 
             if serial_number is not None and device_to_open.serial_number != serial_number:
                 message = "The only detected device does not have a matching serial number!"
-                raise CySerialBridgeError(message)
+                return None, message
 
         else:  # Multiple devices
             # Search by serial number
             if serial_number is None:
                 message = "Multiple devices found but no serial number provided!"
-                raise CySerialBridgeError(message)
+                return None, message
 
-            any_unopenable_devices = False
-            device_to_open = None
-            for device in devices:
-                if device.open_failed:
-                    any_unopenable_devices = True
-                elif device.serial_number == serial_number:
-                    device_to_open = device
-                    break
+            device_to_open = next(
+                (device for device in devices if not device.open_failed and device.serial_number == serial_number),
+                None,
+            )
 
             if device_to_open is None:
-                if any_unopenable_devices:
+                if any(device.open_failed for device in devices):
                     message = "Did not find an exact match for serial number.  However, at least one candidate device with was found that could not be opened!"
                     if sys.platform == "win32":
                         message += "  This is likely because it does not have the WinUSB driver attached."
-                    raise CySerialBridgeError(message)
+                    return None, message
                 else:
                     message = "Multiple devices found but none matched the specified serial number!"
-                    raise CySerialBridgeError(message)
+                    return None, message
 
         # mypy isn't smart enough to understand that device_to_open cannot be None at this point
         # so we have to help it out.
@@ -328,12 +534,17 @@ class CyScbContext:
             and device_to_open.serial_port_name is None
         ):
             message = "Unable to detect the correct serial port to open for this device!"
-            raise CySerialBridgeError(message)
+            return None, message
 
-        return device_to_open
+        return device_to_open, None
 
     def open_device(
-        self, vid: int, pids: Union[int, set[int]], open_mode: OpenMode, serial_number: str | None = None
+        self,
+        vid: int,
+        pids: Union[int, set[int]],
+        open_mode: OpenMode,
+        serial_number: str | None = None,
+        skip_handshake: bool = False,
     ) -> AnyDriverClass:
         """
         Convenience function for opening a CY7C652xx SCB device in a desired mode.
@@ -348,13 +559,12 @@ class CyScbContext:
         :param pids: Product IDs of the device you want to open.  Accepts either a single integer or a set of ints
         :param serial_number: Serial number of the device you want to open.  May be left as None if there is only one device attached.
         :param open_mode: Mode to open the SCB device in
+        :param skip_handshake: If true, and the device was opened in the same mode within the last few seconds,
+            don't re-check its signature and firmware version when opening it.  Useful for scripts which open the
+            same device many times in a row.  Has no effect for UART_CDC mode.
         """
         # Step 1: Search for matching devices on the system
-        if type(pids) is int:
-            pids = {pids}
-
-        # pids will always be a set[int] at this point but mypy can't seem to figure that out
-        pids = cast(set[int], pids)
+        pids = self._normalize_pids(pids)
 
         device_to_open = self.scan_for_device(vid, pids, open_mode, serial_number)
 
@@ -365,39 +575,75 @@ class CyScbContext:
             log.info(
                 f"The CyType of this device must be changed to {needed_cytype.name} in order to open it as {open_mode.name}"
             )
-            change_type_start_time = time.time()
-
-            # Open the device in manufacturer mode and change its type
-            with driver.CyMfgrIface(self, device_to_open) as mfgr_driver:
-                mfgr_driver.change_type(needed_cytype)
-                mfgr_driver.reset_device()
-
-            # Wait for the device to re-enumerate with the new type
-            while True:
-                try:
-                    device_to_open = self.scan_for_device(vid, pids, open_mode, serial_number)
-
-                    # log.debug(f"Scan found a device with CyType {device_to_open.curr_cytype}")
+            change_type_start_time = time.monotonic()
+            change_type_deadline = change_type_start_time + self.CHANGE_TYPE_TIMEOUT
+
+            # Where libusb supports it, ask to be woken up when a device arrives instead of just sleeping between
+            # scans.  This has to be registered before the reset so that we cannot miss the arrival.
+            hotplug_handle: int | None = None
+            device_arrived = False
+
+            def on_device_arrived(_context: usb1.USBContext, _device: usb1.USBDevice, _event: int) -> bool:
+                # Note: Called from inside libusb event handling, so must not make any synchronous libusb calls
+                nonlocal device_arrived
+                device_arrived = True
+                return False
+
+            if usb1.hasCapability(usb1.CAP_HAS_HOTPLUG):
+                hotplug_handle = self.usb_context.hotplugRegisterCallback(
+                    on_device_arrived,
+                    events=usb1.HOTPLUG_EVENT_DEVICE_ARRIVED,
+                    flags=0,
+                    vendor_id=vid,
+                )
 
-                    if device_to_open.curr_cytype == needed_cytype:
+            try:
+                # Open the device in manufacturer mode and change its type
+                with driver.CyMfgrIface(self, device_to_open) as mfgr_driver:
+                    mfgr_driver.change_type(needed_cytype)
+                    mfgr_driver.reset_device()
+                self._needs_win_reset = True
+
+                # The device will come back with a new serial port (or none at all), so forget what we knew
+                self._serno_cache.clear()
+
+                # Wait for the device to re-enumerate with the new type.
+                # Poll quickly at first, then back off so that a slow re-enumeration doesn't cost us a bus scan
+                # every 10ms.
+                retry_delay = self.CHANGE_TYPE_MIN_POLL_INTERVAL
+                while True:
+                    rescanned_device = self.scan_for_device_or_none(vid, pids, open_mode, serial_number)
+
+                    # log.debug(f"Scan found a device with CyType {rescanned_device.curr_cytype}")
+
+                    if rescanned_device is not None and rescanned_device.curr_cytype == needed_cytype:
+                        device_to_open = rescanned_device
                         break
-                except Exception as ex:
-                    if time.time() < change_type_start_time + self.CHANGE_TYPE_TIMEOUT:
-                        # Not found but still within the timeout, wait a bit and try again
-                        time.sleep(0.01)
+                    elif time.monotonic() >= change_type_deadline:
+                        if rescanned_device is None:
+                            message = "Timeout waiting for device to re-enumerate after changing its type."
+                        else:
+                            message = "The CyType of the device did not change to the correct value within the timeout!"
+                        raise CySerialBridgeError(message)
                     else:
-                        message = "Timeout waiting for device to re-enumerate after changing its type."
-                        raise CySerialBridgeError(message) from ex
-
-                if (
-                    device_to_open is not None
-                    and time.time() >= change_type_start_time + self.CHANGE_TYPE_TIMEOUT
-                    and device_to_open.curr_cytype != needed_cytype
-                ):
-                    message = "The CyType of the device did not change to the correct value within the timeout!"
-                    raise CySerialBridgeError(message)
-
-            log.info(f"Changed type of device in {time.time() - change_type_start_time:.04f} sec")
+                        # Not found but still within the timeout.
+                        # With hotplug, there is no point in scanning again until a device has arrived, so sleep in
+                        # libusb until then.  Once it has arrived (or without hotplug), poll with backoff, since
+                        # e.g. the serial port can show up some time after the USB device.
+                        if hotplug_handle is not None and not device_arrived:
+                            while not device_arrived and time.monotonic() < change_type_deadline:
+                                self.usb_context.handleEventsTimeout(max(change_type_deadline - time.monotonic(), 0))
+                        else:
+                            time.sleep(retry_delay)
+                            retry_delay = min(retry_delay * 2, self.CHANGE_TYPE_MAX_POLL_INTERVAL)
+            finally:
+                if hotplug_handle is not None:
+                    self.usb_context.hotplugDeregisterCallback(hotplug_handle)
+
+            # Device has re-enumerated, so no need to keep reopening the context
+            self._needs_win_reset = False
+
+            log.info(f"Changed type of device in {time.monotonic() - change_type_start_time:.04f} sec")
 
         # Step 3: Instantiate the driver!
         if open_mode == OpenMode.UART_CDC:
@@ -409,4 +655,110 @@ class CyScbContext:
                 raise CySerialBridgeError(message)
             return serial.Serial(port=device_to_open.serial_port_name)
         else:
-            return typing.cast(AnyDriverClass, driver_class(self, device_to_open))  # type: ignore[call-arg]
+            return typing.cast(
+                AnyDriverClass,
+                driver_class(self, device_to_open, skip_handshake=skip_handshake),  # type: ignore[call-arg]
+            )
+
+
+@functools.lru_cache(maxsize=16)
+def _vid_pid_filter(vid: int, pids: frozenset[int]) -> frozenset[tuple[int, int]]:
+    """
+    Build the VID/PID filter passed to list_devices() for one VID and a set of PIDs.
+
+    Cached, since open_device() scans for the same devices over and over while waiting for a type change.
+    """
+    return frozenset((vid, pid) for pid in pids)
+
+
+def _filter_and_describe(
+    dev: usb1.USBDevice, vid_pids: Set[tuple[int, int]] | None, valid_vids: Set[int] | None
+) -> DiscoveredDevice | None:
+    """
+    Check whether a USB device looks like a CY7C652xx and, if so, describe it.
+
+    This is the hot part of device enumeration, so it is kept as a standalone, fully annotated function
+    that can be compiled with mypyc if enumeration speed ever matters.
+    valid_vids must be the set of VIDs appearing in vid_pids (or None if vid_pids is None), and is used to
+    reject most devices before looking at anything else.
+    Returns None if the device is not a serial bridge.  String descriptors are not read here.
+    """
+    vid: int = dev.getVendorID()
+    if valid_vids is not None and vid not in valid_vids:
+        return None
+
+    pid: int = dev.getProductID()
+    if vid_pids is not None:
+        even_pid = pid & 0xFFFE
+        if (vid, even_pid) not in vid_pids and (vid, even_pid + 1) not in vid_pids:
+            # Not a VID-PID we're looking for
+            return None
+
+    # Only now that we know the device is a candidate do we look at its configuration descriptor.
+    # CY7C652xx devices always have one configuration.
+    # Check the count from the device descriptor first, then make sure that configuration could actually be read.
+    if dev.getNumConfigurations() != 1 or len(dev) != 1:
+        return None
+    cfg: usb1.USBConfiguration = dev[0]
+
+    # CY7C652xx devices always have either two or three interfaces: potentially one for the USB CDC COM port,
+    # one for the actual USB-serial bridge, and one for the configuration interface.
+    # CY7C65215 and CY7C65215A devices have (up to?) 4 interfaces.
+    # CY7C65215 devices could have 0-2 CDC interfaces, up to one on each SCB
+    num_interfaces: int = cfg.getNumInterfaces()
+    if num_interfaces != 2 and num_interfaces != 3 and num_interfaces != 4:
+        return None
+
+    usb_cdc_interface_settings: usb1.USBInterfaceSetting | None = None
+    cdc_data_interface_settings: usb1.USBInterfaceSetting | None = None
+    scb_interface_settings: usb1.USBInterfaceSetting | None = None
+    mfg_interface_settings: usb1.USBInterfaceSetting | None = None
+    curr_cytype: CyType | None = None
+
+    for i in range(num_interfaces):
+        intf_type = CyScbContext.identify_interface(cfg[i])
+        if intf_type is None:
+            pass # TODO verbose output
+        else:
+            match(intf_type):
+                case CyType.UART_CDC: # TODO we could have two of these!
+                    usb_cdc_interface_settings = cfg[i][0]
+                    curr_cytype = CyType.UART_CDC
+                case CyType.CDC_DATA:
+                    cdc_data_interface_settings = cfg[i][0]
+                case CyType.MFG:
+                    mfg_interface_settings = cfg[i][0]
+                case CyType.I2C: # TODO we could have two of these!
+                    scb_interface_settings = cfg[i][0]
+                    curr_cytype = CyType.I2C
+                case CyType.SPI:
+                    scb_interface_settings = cfg[i][0]
+                    curr_cytype = CyType.SPI
+                case CyType.JTAG:
+                    scb_interface_settings = cfg[i][0]
+                    curr_cytype = CyType.JTAG
+                case CyType.UART_VENDOR:
+                    scb_interface_settings = cfg[i][0]
+                    curr_cytype = CyType.UART_VENDOR
+
+    if curr_cytype is None or mfg_interface_settings is None \
+        or (scb_interface_settings is None and usb_cdc_interface_settings is None):
+        # TODO verbose output
+        return None
+
+    if mfg_interface_settings is not None: curr_cytype = CyType.MFG
+
+    # If we got all the way here, it looks like a CY6C652xx device!
+    # Record attributes and return them
+    return DiscoveredDevice(
+        usb_device=dev,
+        usb_configuration=cfg,
+        mfg_interface_settings=mfg_interface_settings,
+        scb_interface_settings=scb_interface_settings,
+        usb_cdc_interface_settings=usb_cdc_interface_settings,
+        cdc_data_interface_settings=cdc_data_interface_settings,
+        vid=vid,
+        pid=pid,
+        curr_cytype=curr_cytype,
+        open_failed=False,
+    )
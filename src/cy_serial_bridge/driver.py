@@ -1,14 +1,15 @@
 from __future__ import annotations
 
 import contextlib
+import struct
 import sys
 import time
 from dataclasses import dataclass
 from enum import Enum
-from math import ceil
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING, NoReturn, cast
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
     from types import TracebackType
 
     from typing_extensions import Self
@@ -28,6 +29,21 @@ the correct USB device or (b) manipulating configuration blocks.  Those get thei
 modules.
 """
 
+# Precompiled struct layouts, so that the format strings are not re-parsed on every transfer
+_FIRMWARE_VERSION_STRUCT = struct.Struct("<BBHI")
+_I2C_CONFIG_STRUCT = struct.Struct(CY_USB_I2C_CONFIG_STRUCT_LAYOUT)
+_SPI_CONFIG_STRUCT = struct.Struct(CY_USB_SPI_CONFIG_STRUCT_LAYOUT)
+_U16_LE_STRUCT = struct.Struct("<H")
+
+# Plain int copies of the enum constants used on every I2C transfer, to save the enum attribute lookups
+_I2C_GET_STATUS_CMD = int(CyVendorCmds.CY_I2C_GET_STATUS_CMD)
+_I2C_RESET_CMD = int(CyVendorCmds.CY_I2C_RESET_CMD)
+_I2C_READ_CMD = int(CyVendorCmds.CY_I2C_READ_CMD)
+_I2C_WRITE_CMD = int(CyVendorCmds.CY_I2C_WRITE_CMD)
+_I2C_GET_STATUS_LEN = int(CyI2c.GET_STATUS_LEN)
+_I2C_EVENT_NOTIFICATION_LEN = int(CyI2c.EVENT_NOTIFICATION_LEN)
+_I2C_ERROR_BIT = int(CyI2c.ERROR_BIT)
+
 
 # Exceptions for recoverable I2C errors
 class I2CNACKError(CySerialBridgeError):
@@ -53,13 +69,56 @@ class I2CArbLostError(CySerialBridgeError):
     """
 
 
+# Exception to raise for each I2C error status bit, in order of precedence
+_I2C_ERROR_BITS_TO_EXCEPTION: tuple[tuple[int, type[CySerialBridgeError]], ...] = (
+    (CyI2c.ARBITRATION_ERROR_BIT, I2CArbLostError),
+    (CyI2c.NAK_ERROR_BIT, I2CNACKError),
+    (CyI2c.BUS_ERROR_BIT, I2CBusError),
+)
+
+
+# Exception raised by libusb's synchronous API for each possible failure status of an asynchronous transfer
+_TRANSFER_STATUS_TO_EXCEPTION: dict[int, type[usb1.USBError]] = {
+    usb1.TRANSFER_ERROR: usb1.USBErrorIO,
+    usb1.TRANSFER_TIMED_OUT: usb1.USBErrorTimeout,
+    usb1.TRANSFER_CANCELLED: usb1.USBErrorInterrupted,
+    usb1.TRANSFER_STALL: usb1.USBErrorPipe,
+    usb1.TRANSFER_NO_DEVICE: usb1.USBErrorNoDevice,
+    usb1.TRANSFER_OVERFLOW: usb1.USBErrorOverflow,
+}
+
+# Attribute of CySerBridgeBase which stores each (transfer type, direction) of endpoint on the SCB interface
+_SCB_ENDPOINT_ATTR_NAMES: dict[tuple[int, int], str] = {
+    (EP_BULK, EP_IN): "ep_in",
+    (EP_BULK, EP_OUT): "ep_out",
+    (EP_INTR, EP_IN): "ep_intr",
+}
+
+# Firmware versions read during recent successful handshakes, as
+# (bus number, device address, CyType, SCB index) -> (handshake time, firmware version).
+# Used to skip the handshake when reopening a device with skip_handshake=True.
+_handshake_cache: dict[tuple[int, int, CyType, int], tuple[float, tuple[int, int, int, int]]] = {}
+
+
 class CySerBridgeBase:
     """
     Base class containing functionality common to all modes of a CY7C652xx
     """
 
+    # Maximum number of control transfers which _control_transfer_batch() keeps in flight at once
+    CONTROL_QUEUE_DEPTH = 4
+
+    # How long the result of a handshake with a device can be reused when skip_handshake is set
+    HANDSHAKE_CACHE_TTL = 5.0  # s
+
     def __init__(
-        self, context: CyScbContext, discovered_dev: DiscoveredDevice, cy_type: CyType, scb_index: int, timeout: int
+        self,
+        context: CyScbContext,
+        discovered_dev: DiscoveredDevice,
+        cy_type: CyType,
+        scb_index: int,
+        timeout: int,
+        skip_handshake: bool = False,
     ):
         """
         Create a CySerBridgeBase.
@@ -68,6 +127,8 @@ class CySerBridgeBase:
         :param cy_type: Type to open the device as.
         :param scb_index: Index of the SCB to open, for multi-port devices
         :param timeout: Timeout to use for USB operations in milliseconds
+        :param skip_handshake: If true, and the same device was opened in the same mode within the last
+            HANDSHAKE_CACHE_TTL seconds, don't re-read its signature and firmware version when opening it.
         """
         if scb_index > 1:
             message = "scb_index cannot be higher than 1!"
@@ -79,9 +140,15 @@ class CySerBridgeBase:
         self.discovered_dev = discovered_dev
 
         self.timeout = timeout
+        self.skip_handshake = skip_handshake
+
+        # Transfers for use with the libusb async API.  These are allocated when first needed and reused
+        # for the lifetime of the open device, see _get_transfers().
+        self._transfer_pool: list[usb1.USBTransfer] = []
 
         self.ep_in = None
         self.ep_out = None
+        self.ep_intr = None
 
         if self.cy_type == CyType.MFG and self.discovered_dev.curr_cytype == CyType.UART_CDC:
             if sys.platform == "darwin":
@@ -102,15 +169,10 @@ class CySerBridgeBase:
             # grab EPs from SCB endpoint
             ep: usb1.USBEndpoint
             for ep in self.discovered_dev.scb_interface_settings:
-                ep_attr = ep.getAttributes()
                 ep_addr = ep.getAddress()
-                if ep_attr == EP_BULK:
-                    if ep_addr & EP_IN:
-                        self.ep_in = ep_addr
-                    else:
-                        self.ep_out = ep_addr
-                elif ep_attr == EP_INTR:
-                    self.ep_intr = ep_addr
+                ep_attr_name = _SCB_ENDPOINT_ATTR_NAMES.get((ep.getAttributes(), ep_addr & EP_IN))
+                if ep_attr_name is not None:
+                    setattr(self, ep_attr_name, ep_addr)
 
         # Check that we got the expected endpoints (though the manufacturer interface doesn't have them)
         if cy_type != CyType.MFG and (self.ep_in is None or self.ep_out is None or self.ep_intr is None):
@@ -147,11 +209,11 @@ class CySerBridgeBase:
                     self.discovered_dev.mfg_interface_settings,
                     self.discovered_dev.scb_interface_settings,
                     self.discovered_dev.usb_cdc_interface_settings,
-                    self.discovered_dev.usb_cdc_interface_settings,
                 )
 
-                for interface in filter(lambda iface: iface is not None, all_interfaces):
-                    if self.dev.kernelDriverActive(interface.getNumber()):
+                for interface in (iface for iface in all_interfaces if iface is not None):
+                    # Detaching fails with NOT_FOUND if no driver is attached, so there's no need to check first
+                    with contextlib.suppress(usb1.USBErrorNotFound):
                         self.dev.detachKernelDriver(interface.getNumber())
 
             if self.cy_type == CyType.MFG:
@@ -172,20 +234,35 @@ class CySerBridgeBase:
 
             temp_stack.enter_context(self.dev.claimInterface(target_interface.getNumber()))
 
-            # Check the device signature
-            signature = bytes(self.get_signature())
-            log.info("Device signature: %s", repr(signature))
-            if signature != b"CYUS":
-                self.dev.close()
+            handshake_key = (
+                self.discovered_dev.usb_device.getBusNumber(),
+                self.discovered_dev.usb_device.getDeviceAddress(),
+                self.cy_type,
+                self.scb_index,
+            )
+            cached_handshake = _handshake_cache.get(handshake_key) if self.skip_handshake else None
+            if cached_handshake is not None and time.monotonic() - cached_handshake[0] < self.HANDSHAKE_CACHE_TTL:
+                # This device passed the handshake recently, so trust it
+                firmware_version = cached_handshake[1]
+            else:
+                # Check the device signature
+                signature = self.get_signature()
+                log.info("Device signature: %r", signature)
+                if signature != b"CYUS":
+                    self.dev.close()
 
-                message = "Invalid signature for CY7C652xx device"
-                raise CySerialBridgeError(message)
+                    message = "Invalid signature for CY7C652xx device"
+                    raise CySerialBridgeError(message)
 
-            # Get and print the firmware version
-            firmware_version = self.get_firmware_version()
-            print(
-                "Connected to %s interface of CY7C652xx device, firmware version %d.%d.%d build %d"
-                % (self.cy_type.name, *firmware_version)
+                # Get the firmware version
+                firmware_version = self.get_firmware_version()
+                _handshake_cache[handshake_key] = (time.monotonic(), firmware_version)
+
+            # Log the firmware version
+            log.info(
+                "Connected to %s interface of CY7C652xx device, firmware version %d.%d.%d build %d",
+                self.cy_type.name,
+                *firmware_version,
             )
 
             # Creates a new exit stack with ownership of the USB device "moved" into it
@@ -212,6 +289,11 @@ class CySerBridgeBase:
         with contextlib.suppress(usb1.USBErrorNoDevice):
             self.exit_stack.pop_all()
 
+        # Transfers belong to the device handle, so free them before closing it
+        for transfer in self._transfer_pool:
+            transfer.close()
+        self._transfer_pool.clear()
+
         if self.dev:
             self.dev.close()
         self.dev = None
@@ -221,18 +303,193 @@ class CySerBridgeBase:
             raise CySerialBridgeError(message)
         self.context.has_opened_driver = False
 
-    def _wait_for_notification(self, event_notification_len: int, timeout: int) -> None:
+    def _get_transfers(self, count: int) -> list[usb1.USBTransfer]:
         """
-        Wait for a transfer complete notification from the serial bridge.
+        Get transfer objects for use with the libusb async API.
 
-        This is used for background serial transfers.
+        Transfers are pooled and reused between calls, so the caller must make sure that all the returned
+        transfers have completed or been cancelled before it returns.
+        """
+        while len(self._transfer_pool) < count:
+            self._transfer_pool.append(self.dev.getTransfer())
+        return self._transfer_pool[:count]
 
-        :param event_notification_len: Length of event notification
-        :param timeout: Transfer timeout in milliseconds. 0 to disable.
+    def _cancel_transfers(self, transfers: Sequence[usb1.USBTransfer]) -> None:
+        """
+        Cancel any of the given transfers which are still in flight, and wait for the cancellations to finish.
         """
-        transfer = self.dev.getTransfer(0)
-        transfer.setInterrupt(self.ep_intr, event_notification_len, timeout=timeout)
-        transfer.submit()
+        for transfer in transfers:
+            if transfer.isSubmitted():
+                with contextlib.suppress(usb1.USBErrorNotFound):  # Raised if the transfer completed in the meantime
+                    transfer.cancel()
+        while any(transfer.isSubmitted() for transfer in transfers):
+            with contextlib.suppress(usb1.USBErrorInterrupted):
+                self.context.usb_context.handleEvents()
+
+    def _submit_and_wait(
+        self, transfers: Sequence[usb1.USBTransfer], setup_transfers: Sequence[usb1.USBTransfer] = ()
+    ) -> None:
+        """
+        Submit the given (already set up) transfers, then wait for all of them to finish.
+
+        libusb schedules each endpoint separately, so transfers on different endpoints may reach the device in any
+        order, no matter what order they were submitted in.  If setup_transfers are given (control transfers, e.g. the
+        vendor request which starts an I2C or SPI transaction), they are submitted first, and the other transfers are
+        only submitted from the completion callback of the last one, once all of them have succeeded.
+
+        If any transfer fails, the rest are cancelled (or never submitted) rather than being left to time out.
+        The caller is responsible for checking the status of each transfer afterwards.  Setup transfers must be
+        checked first, as transfers which were never submitted still hold the status from their previous use.
+        """
+        submitted_transfers: list[usb1.USBTransfer] = []
+        callback_errors: list[usb1.USBError] = []
+
+        def submit(transfers_to_submit: Sequence[usb1.USBTransfer]) -> None:
+            for transfer in transfers_to_submit:
+                transfer.submit()
+                submitted_transfers.append(transfer)
+
+        def on_setup_complete(_: usb1.USBTransfer) -> None:
+            if any(transfer.getStatus() != usb1.TRANSFER_COMPLETED for transfer in setup_transfers):
+                return
+            # Exceptions can't propagate out of a libusb callback, so save them to raise afterwards
+            try:
+                submit(transfers)
+            except usb1.USBError as ex:
+                callback_errors.append(ex)
+
+        try:
+            if len(setup_transfers) > 0:
+                # The control endpoint handles its transfers in order, so the last one completes last
+                setup_transfers[-1].setCallback(on_setup_complete)
+                submit(setup_transfers)
+            else:
+                submit(transfers)
+
+            while any(transfer.isSubmitted() for transfer in submitted_transfers):
+                with contextlib.suppress(usb1.USBErrorInterrupted):
+                    self.context.usb_context.handleEvents()
+
+                if len(callback_errors) > 0 or any(
+                    not transfer.isSubmitted() and transfer.getStatus() != usb1.TRANSFER_COMPLETED
+                    for transfer in submitted_transfers
+                ):
+                    break
+
+            if len(callback_errors) > 0:
+                raise callback_errors[0]
+        finally:
+            if len(setup_transfers) > 0:
+                setup_transfers[-1].setCallback(None)
+            self._cancel_transfers(submitted_transfers)
+
+    @staticmethod
+    def _release_transfer_buffers(transfers: Sequence[usb1.USBTransfer]) -> None:
+        """
+        Make the given (finished) transfers drop the data buffers they were last set up with.
+
+        libusb1 uses a writable buffer passed to a transfer (e.g. a bytearray) in place, and keeps it exported, so that
+        it cannot be resized, for as long as the transfer refers to it.  Pooled transfers outlive the call that used
+        them, so this must be called before returning whenever a transfer was given a buffer owned by the caller.
+        """
+        for transfer in transfers:
+            transfer.setBulk(transfer.getEndpoint(), 0)
+
+    @staticmethod
+    def _check_transfer_status(transfer: usb1.USBTransfer) -> None:
+        """
+        Check that an asynchronous transfer completed successfully.
+
+        If it did not, raises the same exception that the equivalent synchronous libusb call would have.
+        """
+        status = transfer.getStatus()
+        if status != usb1.TRANSFER_COMPLETED:
+            raise _TRANSFER_STATUS_TO_EXCEPTION.get(status, usb1.USBErrorIO)()
+
+    @classmethod
+    def _check_transfer_statuses(cls, transfers: Sequence[usb1.USBTransfer]) -> None:
+        """
+        Check that a group of asynchronous transfers which were waited for together all completed successfully.
+
+        When one transfer of the group fails, _submit_and_wait() cancels the others, so the error of a transfer which
+        actually failed (e.g. a timeout) is raised in preference to the CANCELLED status of the others.
+        """
+        failed_transfers = [transfer for transfer in transfers if transfer.getStatus() != usb1.TRANSFER_COMPLETED]
+        for transfer in failed_transfers:
+            if transfer.getStatus() != usb1.TRANSFER_CANCELLED:
+                cls._check_transfer_status(transfer)
+        for transfer in failed_transfers:
+            cls._check_transfer_status(transfer)
+
+    def _control_transfer_batch(
+        self, requests: Sequence[tuple[int, int, int, int, ByteSequence | int]], timeout: int
+    ) -> list[bytes]:
+        """
+        Execute a sequence of control transfers, keeping up to CONTROL_QUEUE_DEPTH of them queued at once
+        so that the USB round trip latency of each one overlaps with the others.
+
+        The transfers are executed by the device in order.  If any of them fails, the remaining ones are cancelled
+        and the corresponding USBError is raised.
+
+        Note: Like spi_transfer(), this drives libusb's event loop from the calling thread.
+
+        :param requests: Control transfers to make, each given as a tuple of (request type, request, value, index,
+            data to write or length to read), like the arguments to controlWrite() and controlRead().
+            As with those functions, the direction bit of the request type is set based on the last element.
+        :param timeout: Timeout for each transfer in milliseconds.  0 to disable.
+
+        :return: Data received by each transfer, in order.  Empty for host-to-device transfers.
+        """
+        results: list[bytes] = [b""] * len(requests)
+        completed_transfers: list[usb1.USBTransfer] = []
+        next_request_idx = 0
+        num_done = 0
+
+        def submit_next_request(transfer: usb1.USBTransfer) -> None:
+            nonlocal next_request_idx
+            request_type, request, value, index, data_or_length = requests[next_request_idx]
+
+            # Same as controlRead() and controlWrite(), set the direction bit based on what we're doing
+            direction = EP_IN if isinstance(data_or_length, int) else EP_OUT
+            transfer.setControl(
+                (request_type & ~EP_IN) | direction,
+                request,
+                value,
+                index,
+                data_or_length,
+                callback=completed_transfers.append,
+                user_data=next_request_idx,
+                timeout=timeout,
+            )
+            transfer.submit()
+            next_request_idx += 1
+
+        transfers = self._get_transfers(min(self.CONTROL_QUEUE_DEPTH, len(requests)))
+        try:
+            for transfer in transfers:
+                submit_next_request(transfer)
+
+            while num_done < len(requests):
+                with contextlib.suppress(usb1.USBErrorInterrupted):
+                    self.context.usb_context.handleEvents()
+
+                while len(completed_transfers) > 0:
+                    transfer = completed_transfers.pop()
+                    self._check_transfer_status(transfer)
+
+                    request_idx = transfer.getUserData()
+                    if isinstance(requests[request_idx][4], int):
+                        results[request_idx] = bytes(transfer.getBuffer()[: transfer.getActualLength()])
+                    num_done += 1
+
+                    # Reuse this transfer for the next request in line
+                    if next_request_idx < len(requests):
+                        submit_next_request(transfer)
+        finally:
+            # Transfers can only still be in flight here if something went wrong
+            self._cancel_transfers(transfers)
+
+        return results
 
     # Common functions which work in all interface modes --------------------------------
     def get_firmware_version(self) -> tuple[int, int, int, int]:
@@ -261,7 +518,7 @@ class CySerBridgeBase:
         #
         # } CY_FIRMWARE_VERSION, *PCY_FIRMWARE_VERSION;
 
-        return cast(tuple[int, int, int, int], struct.unpack("<BBHI", firmware_version_bytes))
+        return cast(tuple[int, int, int, int], _FIRMWARE_VERSION_STRUCT.unpack(firmware_version_bytes))
 
     def get_signature(self) -> ByteSequence:
         """
@@ -287,6 +544,12 @@ class CySerBridgeBase:
         nonfunctional and should be closed.  You must open a new instance of the driver
         after the device re-enumerates.
         """
+        # The device will re-enumerate, possibly at the same address, so forget its handshake
+        usb_device = self.discovered_dev.usb_device
+        bus_and_address = (usb_device.getBusNumber(), usb_device.getDeviceAddress())
+        for handshake_key in [key for key in _handshake_cache if key[:2] == bus_and_address]:
+            del _handshake_cache[handshake_key]
+
         bm_request_type = CY_VENDOR_REQUEST | EP_IN
         bm_request = CyVendorCmds.CY_DEVICE_RESET_CMD
         w_value = 0xA6B6
@@ -320,18 +583,24 @@ class CySerBridgeBase:
             message = "Program operation outside user flash bounds!"
             raise ValueError(message)
 
+        # Queue up all the page writes at once so that we don't wait for a full round trip per page
+        # Slice pages out of a memoryview so that each page is not copied into a new bytes object first
         num_pages = len(buff) // USER_FLASH_PAGE_SIZE
+        buff_view = memoryview(buff)
+        page_write_requests = []
         for page_idx in range(num_pages):
             first_byte_idx = page_idx * USER_FLASH_PAGE_SIZE
-            bytes_to_send = buff[first_byte_idx : first_byte_idx + USER_FLASH_PAGE_SIZE]
-            self.dev.controlWrite(
-                request_type=CY_VENDOR_REQUEST_DEVICE_TO_HOST,
-                request=CyVendorCmds.CY_PROG_USER_FLASH_CMD,
-                value=0,
-                index=addr + first_byte_idx,
-                data=bytes_to_send,
-                timeout=self.timeout,
+            bytes_to_send = buff_view[first_byte_idx : first_byte_idx + USER_FLASH_PAGE_SIZE]
+            page_write_requests.append(
+                (
+                    CY_VENDOR_REQUEST_DEVICE_TO_HOST,
+                    CyVendorCmds.CY_PROG_USER_FLASH_CMD,
+                    0,
+                    addr + first_byte_idx,
+                    bytes_to_send,
+                )
             )
+        self._control_transfer_batch(page_write_requests, self.timeout)
 
     def read_user_flash(self, addr: int, size: int) -> bytearray:
         """
@@ -349,19 +618,26 @@ class CySerBridgeBase:
             message = "Read operation outside user flash bounds!"
             raise ValueError(message)
 
-        result_bytes = bytearray()
-
+        # Queue up all the page reads at once so that we don't wait for a full round trip per page
         num_pages = size // USER_FLASH_PAGE_SIZE
-        for page_idx in range(num_pages):
-            page_bytes = self.dev.controlRead(
-                request_type=CY_VENDOR_REQUEST_DEVICE_TO_HOST,
-                request=CyVendorCmds.CY_READ_USER_FLASH_CMD,
-                value=0,
-                index=addr + page_idx * USER_FLASH_PAGE_SIZE,
-                length=USER_FLASH_PAGE_SIZE,
-                timeout=self.timeout,
+        page_read_requests: list[tuple[int, int, int, int, ByteSequence | int]] = [
+            (
+                CY_VENDOR_REQUEST_DEVICE_TO_HOST,
+                CyVendorCmds.CY_READ_USER_FLASH_CMD,
+                0,
+                addr + page_idx * USER_FLASH_PAGE_SIZE,
+                USER_FLASH_PAGE_SIZE,
             )
-            result_bytes.extend(page_bytes)
+            for page_idx in range(num_pages)
+        ]
+
+        result_bytes = bytearray(size)
+        result_view = memoryview(result_bytes)
+        for page_idx, page_bytes in enumerate(self._control_transfer_batch(page_read_requests, self.timeout)):
+            if len(page_bytes) != USER_FLASH_PAGE_SIZE:
+                message = f"Expected {USER_FLASH_PAGE_SIZE} bytes from user flash read but got {len(page_bytes)}!"
+                raise CySerialBridgeError(message)
+            result_view[page_idx * USER_FLASH_PAGE_SIZE : (page_idx + 1) * USER_FLASH_PAGE_SIZE] = page_bytes
 
         return result_bytes
 
@@ -415,7 +691,12 @@ class CyMfgrIface(CySerBridgeBase):
     """
 
     def __init__(
-        self, context: CyScbContext, discovered_dev: DiscoveredDevice, scb_index: int = 0, timeout: int = 1000
+        self,
+        context: CyScbContext,
+        discovered_dev: DiscoveredDevice,
+        scb_index: int = 0,
+        timeout: int = 1000,
+        skip_handshake: bool = False,
     ):
         """
         Create a CySerBridgeBase.
@@ -427,8 +708,9 @@ class CyMfgrIface(CySerBridgeBase):
         :param discovered_dev: Discovered device to open (from list_devices())
         :param scb_index: Index of the SCB to open, for multi-port devices
         :param timeout: Timeout to use for USB operations in milliseconds
+        :param skip_handshake: Reuse the result of a recent handshake with the device, see CySerBridgeBase
         """
-        super().__init__(context, discovered_dev, CyType.MFG, scb_index, timeout)
+        super().__init__(context, discovered_dev, CyType.MFG, scb_index, timeout, skip_handshake)
 
     ######################################################################
     # Non-public APIs still under experimental stage
@@ -440,7 +722,7 @@ class CyMfgrIface(CySerBridgeBase):
         bm_request = 203
         w_value = 0
         w_index = 0
-        w_buffer = bytearray(0)
+        w_buffer = b""
 
         return cast(int, self.dev.controlWrite(bm_request_type, bm_request, w_value, w_index, w_buffer, self.timeout))
 
@@ -465,7 +747,7 @@ class CyMfgrIface(CySerBridgeBase):
         bm_request = CyVendorCmds.CY_VENDOR_ENTER_MFG_MODE
         w_value = 0xA6BC
         w_index = 0xB1B0
-        w_buffer = bytearray(0)
+        w_buffer = b""
 
         return cast(int, self.dev.controlWrite(bm_request_type, bm_request, w_value, w_index, w_buffer, self.timeout))
 
@@ -477,7 +759,7 @@ class CyMfgrIface(CySerBridgeBase):
         bm_request = CyVendorCmds.CY_VENDOR_ENTER_MFG_MODE
         w_value = 0xA6BC
         w_index = 0xB9B0
-        w_buffer = bytearray(0)
+        w_buffer = b""
 
         return cast(int, self.dev.controlWrite(bm_request_type, bm_request, w_value, w_index, w_buffer, self.timeout))
 
@@ -572,7 +854,12 @@ class CyI2CControllerBridge(CySerBridgeBase):
     """
 
     def __init__(
-        self, context: CyScbContext, discovered_dev: DiscoveredDevice, scb_index: int = 0, timeout: int = 1000
+        self,
+        context: CyScbContext,
+        discovered_dev: DiscoveredDevice,
+        scb_index: int = 0,
+        timeout: int = 1000,
+        skip_handshake: bool = False,
     ):
         """
         Create a CyI2CControllerBridge.
@@ -584,29 +871,48 @@ class CyI2CControllerBridge(CySerBridgeBase):
         :param discovered_dev: Discovered device to open (from list_devices())
         :param scb_index: Index of the SCB to open, for multi-port devices
         :param timeout: Timeout to use for general USB operations in milliseconds
+        :param skip_handshake: Reuse the result of a recent handshake with the device, see CySerBridgeBase
         """
-        super().__init__(context, discovered_dev, CyType.I2C, scb_index, timeout)
+        super().__init__(context, discovered_dev, CyType.I2C, scb_index, timeout, skip_handshake)
 
         self._curr_frequency: int | None = None
 
+        # SCB index bits of the value field of I2C read and write requests
+        self._scb_high = self.scb_index << CY_SCB_INDEX_POS
+
+        # First byte of the most recent I2C status we know of for each mode, or None if it is not known.
+        # At the end of every transfer, the bridge sends us its status, so there is usually no need to spend a USB
+        # round trip asking for it again before the next transfer.  It is only recorded after a transfer that finished
+        # cleanly, so after any failure, the next transfer queries the chip.
+        self._last_i2c_status: dict[CyI2c, int | None] = {CyI2c.MODE_READ: None, CyI2c.MODE_WRITE: None}
+
     def __enter__(self) -> Self:
         super().__enter__()
 
         # Reset the I2C peripheral in case it was in a bad state (e.g. if a previous errored operation
-        # was not cleaned up)
+        # was not cleaned up, or a previous session left the bus held).  Not all of those states show up in the
+        # error bit of the status, so always do this.
         self._i2c_reset(CyI2c.MODE_READ)
         self._i2c_reset(CyI2c.MODE_WRITE)
 
         # Should be in a good state now
-        if self._get_i2c_status(CyI2c.MODE_READ)[0] & CyI2c.ERROR_BIT:
-            message = "I2C read interface is not ready!"
-            raise CySerialBridgeError(message)
-        if self._get_i2c_status(CyI2c.MODE_WRITE)[0] & CyI2c.ERROR_BIT:
-            message = "I2C write interface is not ready!"
-            raise CySerialBridgeError(message)
+        for mode, mode_name in ((CyI2c.MODE_READ, "read"), (CyI2c.MODE_WRITE, "write")):
+            status_flags = self._get_i2c_status(mode)[0]
+            if status_flags & _I2C_ERROR_BIT:
+                message = f"I2C {mode_name} interface is not ready!"
+                raise CySerialBridgeError(message)
+            self._last_i2c_status[mode] = status_flags
 
         return self
 
+    def _compute_timeout(self, transaction_size_bytes: int) -> int:
+        """
+        Compute a reasonable timeout for an I2C transaction.
+        """
+        # Assume it takes 10 bit times per byte sent, and also allow 1 extra second for any USB overhead.
+        # Integer ceiling division gives the same result as ceil() without going through floats.
+        return 1000 + -(-transaction_size_bytes * 10000 // cast(int, self._curr_frequency))
+
     def _get_i2c_status(self, mode: CyI2c) -> ByteSequence:
         """
         Get the I2C status flag from the chip.
@@ -616,17 +922,30 @@ class CyI2CControllerBridge(CySerBridgeBase):
 
         :param mode: Either CyI2c.MODE_WRITE or CyI2c.MODE_READ
         """
-        return cast(
+        status = cast(
             ByteSequence,
             self.dev.controlRead(
                 request_type=CY_VENDOR_REQUEST_DEVICE_TO_HOST,
-                request=CyVendorCmds.CY_I2C_GET_STATUS_CMD,
-                value=(self.scb_index << CY_SCB_INDEX_POS) | mode,
+                request=_I2C_GET_STATUS_CMD,
+                value=self._scb_high | mode,
                 index=0,
-                length=CyI2c.GET_STATUS_LEN,
+                length=_I2C_GET_STATUS_LEN,
                 timeout=self.timeout,
             ),
         )
+        return status
+
+    def _i2c_has_error(self, mode: CyI2c) -> bool:
+        """
+        Check whether the I2C module is in an error state, using the status left over from the last transfer
+        if there was one, and querying the chip otherwise.
+
+        :param mode: Either CyI2c.MODE_WRITE or CyI2c.MODE_READ
+        """
+        status = self._last_i2c_status[mode]
+        if status is None:
+            status = self._get_i2c_status(mode)[0]
+        return bool(status & _I2C_ERROR_BIT)
 
     def _i2c_reset(self, mode: CyI2c) -> None:
         """
@@ -634,15 +953,35 @@ class CyI2CControllerBridge(CySerBridgeBase):
 
         :param mode: Either CyI2c.MODE_WRITE or CyI2c.MODE_READ
         """
+        self._last_i2c_status[mode] = None
         self.dev.controlWrite(
             request_type=CY_VENDOR_REQUEST_HOST_TO_DEVICE,
-            request=CyVendorCmds.CY_I2C_RESET_CMD,
-            value=(self.scb_index << CY_SCB_INDEX_POS) | mode,
+            request=_I2C_RESET_CMD,
+            value=self._scb_high | mode,
             index=0,
             data=b"",
             timeout=self.timeout,
         )
 
+    @staticmethod
+    def _raise_i2c_error(post_transfer_status: ByteSequence, bytes_written: int) -> NoReturn:
+        """
+        Raise the exception matching the error bits of a failed I2C transfer's status.
+
+        :param post_transfer_status: Status reported by the chip at the end of the transfer
+        :param bytes_written: Number of bytes written before the error, for I2CNACKError
+        """
+        status_flags = post_transfer_status[0]
+        for error_bit, error_class in _I2C_ERROR_BITS_TO_EXCEPTION:
+            if status_flags & error_bit:
+                error = error_class()
+                if isinstance(error, I2CNACKError):
+                    error.bytes_written = bytes_written
+                raise error
+
+        message = "I2C operation failed with status " + repr(post_transfer_status)
+        raise CySerialBridgeError(message)
+
     def set_i2c_configuration(self, config: CyI2CConfig) -> None:
         """
         This API configures the I2C module of USB Serial device.
@@ -661,8 +1000,7 @@ class CyI2CControllerBridge(CySerBridgeBase):
             message = "Invalid frequency!"
             raise ValueError(message)
 
-        binary_configuration = struct.pack(
-            CY_USB_I2C_CONFIG_STRUCT_LAYOUT,
+        binary_configuration = _I2C_CONFIG_STRUCT.pack(
             config.frequency,
             0,  # sAddress - seems to be ignored in master mode
             1,  # isMsbFirst - Driver always sets this to 1
@@ -694,7 +1032,7 @@ class CyI2CControllerBridge(CySerBridgeBase):
             timeout=self.timeout,
         )
 
-        config_unpacked = struct.unpack(CY_USB_I2C_CONFIG_STRUCT_LAYOUT, config_bytes)
+        config_unpacked = _I2C_CONFIG_STRUCT.unpack(config_bytes)
         config = CyI2CConfig(frequency=config_unpacked[0])
 
         self._curr_frequency = config.frequency
@@ -732,71 +1070,75 @@ class CyI2CControllerBridge(CySerBridgeBase):
             # I tested this and the bridge device does not handle 0-size reads
             message = "Read size must be >= 1"
             raise ValueError(message)
+        if size > CyI2c.MAX_TRANSFER_SIZE:
+            # The whole read is always done as a single bulk transfer, but its length has to fit in the setup request
+            message = f"Read size must be <= {CyI2c.MAX_TRANSFER_SIZE}"
+            raise ValueError(message)
 
-        # For a reasonable timeout, assume it takes 10 bit times per byte sent,
-        # and also allow 1 extra second for any USB overhead.
         if io_timeout is None:
-            io_timeout = 1000 + ceil(1000 * size * (1 / self._curr_frequency) * 10)
-
-        initial_status = self._get_i2c_status(CyI2c.MODE_READ)
+            io_timeout = self._compute_timeout(size)
 
-        if initial_status[0] & CyI2c.ERROR_BIT:
+        if self._i2c_has_error(CyI2c.MODE_READ):
             message = "Device is busy but tried to start another read!"
             raise CySerialBridgeError(message)
 
+        # Until this transfer finishes cleanly, we don't know the status
+        self._last_i2c_status[CyI2c.MODE_READ] = None
+
         # Bits 0 and 1 of the value control stop bit generation and NAK generation at the end of the read.
         # We always want to NAK the slave at the end of the read as it's required by the standard...
-        value = (self.scb_index << 15) | (periph_addr << 8) | 0b10 | (1 if relinquish_bus else 0)
+        value = self._scb_high | (periph_addr << 8) | 0b10 | relinquish_bus
 
-        # Set up transfer
-        self.dev.controlWrite(
-            request_type=CY_VENDOR_REQUEST_HOST_TO_DEVICE,
-            request=CyVendorCmds.CY_I2C_READ_CMD,
-            value=value,
-            index=size,
-            data=b"",
-            timeout=io_timeout,
+        # The data read and the completion notification are submitted as soon as the setup request completes,
+        # from within libusb's event handling, rather than after a separate blocking control transfer.
+        setup_transfer, data_transfer, event_transfer = self._get_transfers(3)
+        setup_transfer.setControl(
+            CY_VENDOR_REQUEST_HOST_TO_DEVICE, _I2C_READ_CMD, value, size, b"", timeout=io_timeout
         )
+        data_transfer.setBulk(self.ep_in, size, timeout=io_timeout)
+        event_transfer.setInterrupt(self.ep_intr, _I2C_EVENT_NOTIFICATION_LEN, timeout=io_timeout)
+        self._submit_and_wait((data_transfer, event_transfer), setup_transfers=(setup_transfer,))
+
+        self._check_transfer_status(setup_transfer)
 
         # Get data
         try:
-            read_data: bytearray = self.dev.bulkRead(self.ep_in, size, timeout=io_timeout)
-            post_transfer_status = self.dev.interruptRead(self.ep_intr, CyI2c.EVENT_NOTIFICATION_LEN, io_timeout)
+            # If one endpoint stalls, the other transfer gets cancelled, so look for the stall first
+            if usb1.TRANSFER_STALL in (data_transfer.getStatus(), event_transfer.getStatus()):
+                raise usb1.USBErrorPipe
+            self._check_transfer_statuses((data_transfer, event_transfer))
+            read_data = bytearray(data_transfer.getBuffer()[: data_transfer.getActualLength()])
+            post_transfer_status = bytes(event_transfer.getBuffer()[: event_transfer.getActualLength()])
 
         except usb1.USBErrorPipe as ex:
             # Attempt to handle pipe errors similarly to how the original driver did.
             # Basically, we reset the hardware and re-query the status.
 
-            # Try and reset the endpoint
-            self.dev.clearHalt(self.ep_in)
+            # Try and reset the endpoint(s) that stalled.  A pipe error means the device really did halt the endpoint,
+            # so this can't be skipped, but there's no need to clear the halt on an endpoint that didn't stall.
+            for transfer in (data_transfer, event_transfer):
+                if transfer.getStatus() == usb1.TRANSFER_STALL:
+                    self.dev.clearHalt(transfer.getEndpoint())
 
             # Recheck the status
             post_transfer_status = self._get_i2c_status(CyI2c.MODE_READ)
 
             # The status should indicate some sort of error
-            if not post_transfer_status[0] & CyI2c.ERROR_BIT:
+            if not post_transfer_status[0] & _I2C_ERROR_BIT:
                 message = "Operation failed with pipe error, but did not detect an I2C comms error?"
                 raise CySerialBridgeError(message) from ex
 
             raise
 
-        if post_transfer_status[0] & CyI2c.ERROR_BIT:
+        status_flags = post_transfer_status[0]
+        if status_flags & _I2C_ERROR_BIT:
             # First reset the read logic
             self._i2c_reset(CyI2c.MODE_READ)
 
             # Finally, handle the error
-            if post_transfer_status[0] & CyI2c.ARBITRATION_ERROR_BIT:
-                raise I2CArbLostError
-            elif post_transfer_status[0] & CyI2c.NAK_ERROR_BIT:
-                error = I2CNACKError()
-                error.bytes_written = 0
-                raise error
-            elif post_transfer_status[0] & CyI2c.BUS_ERROR_BIT:
-                raise I2CBusError
-            else:
-                message = "I2C operation failed with status " + repr(post_transfer_status)
-                raise CySerialBridgeError(message)
+            self._raise_i2c_error(post_transfer_status, bytes_written=0)
 
+        self._last_i2c_status[CyI2c.MODE_READ] = status_flags
         return read_data
 
     def i2c_write(
@@ -827,67 +1169,76 @@ class CyI2CControllerBridge(CySerBridgeBase):
             message = "Invalid peripheral addr, must be a 7 bit address!"
             raise ValueError(message)
 
-        # For a reasonable timeout, assume it takes 10 bit times per byte sent,
-        # and also allow 1 extra second for any USB overhead.
-        if io_timeout is None:
-            io_timeout = 1000 + ceil(1000 * len(data) * (1 / self._curr_frequency) * 10)
+        if len(data) > CyI2c.MAX_TRANSFER_SIZE:
+            # The whole write is always done as a single bulk transfer, but its length has to fit in the setup request
+            message = f"Write size must be <= {CyI2c.MAX_TRANSFER_SIZE}"
+            raise ValueError(message)
 
-        initial_status = self._get_i2c_status(CyI2c.MODE_WRITE)
+        if io_timeout is None:
+            io_timeout = self._compute_timeout(len(data))
 
-        if initial_status[0] & CyI2c.ERROR_BIT:
+        if self._i2c_has_error(CyI2c.MODE_WRITE):
             message = "Device is busy but tried to start another write!"
             raise CySerialBridgeError(message)
 
-        # Bit 0 of the value controls stop bit generation
-        value = (self.scb_index << 15) | (periph_addr << 8) | (1 if relinquish_bus else 0)
+        # Until this transfer finishes cleanly, we don't know the status
+        self._last_i2c_status[CyI2c.MODE_WRITE] = None
 
-        # Set up transfer
-        self.dev.controlWrite(
-            request_type=CY_VENDOR_REQUEST_HOST_TO_DEVICE,
-            request=CyVendorCmds.CY_I2C_WRITE_CMD,
-            value=value,
-            index=len(data),
-            data=b"",
-            timeout=io_timeout,
+        # Bit 0 of the value controls stop bit generation
+        value = self._scb_high | (periph_addr << 8) | relinquish_bus
+
+        # The data write and the completion notification are submitted as soon as the setup request completes, so that
+        # the bridge has handled the request before the data arrives, and the notification is already waiting to be
+        # received when the bridge sends it.
+        setup_transfer, data_transfer, event_transfer = self._get_transfers(3)
+        setup_transfer.setControl(
+            CY_VENDOR_REQUEST_HOST_TO_DEVICE, _I2C_WRITE_CMD, value, len(data), b"", timeout=io_timeout
         )
+        # Note: libusb1 sends writable buffers (e.g. bytearray) in place, so only immutable data gets copied here
+        data_transfer.setBulk(self.ep_out, data, timeout=io_timeout)
+        event_transfer.setInterrupt(self.ep_intr, _I2C_EVENT_NOTIFICATION_LEN, timeout=io_timeout)
+        try:
+            self._submit_and_wait((data_transfer, event_transfer), setup_transfers=(setup_transfer,))
+        finally:
+            self._release_transfer_buffers((data_transfer,))
+
+        self._check_transfer_status(setup_transfer)
 
         # Send data
         try:
-            self.dev.bulkWrite(self.ep_out, data, timeout=io_timeout)
-            post_transfer_status = self.dev.interruptRead(self.ep_intr, CyI2c.EVENT_NOTIFICATION_LEN, io_timeout)
+            # If one endpoint stalls, the other transfer gets cancelled, so look for the stall first
+            if usb1.TRANSFER_STALL in (data_transfer.getStatus(), event_transfer.getStatus()):
+                raise usb1.USBErrorPipe
+            self._check_transfer_statuses((data_transfer, event_transfer))
+            post_transfer_status = bytes(event_transfer.getBuffer()[: event_transfer.getActualLength()])
         except usb1.USBErrorPipe as ex:
             # Attempt to handle pipe errors similarly to how the original driver did.
             # Basically, we reset the hardware and re-query the status.
 
-            # Try and reset the endpoint
-            self.dev.clearHalt(self.ep_out)
+            # Try and reset the endpoint(s) that stalled, same as i2c_read()
+            for transfer in (data_transfer, event_transfer):
+                if transfer.getStatus() == usb1.TRANSFER_STALL:
+                    self.dev.clearHalt(transfer.getEndpoint())
 
             # Recheck the status
             post_transfer_status = self._get_i2c_status(CyI2c.MODE_WRITE)
 
             # The status should indicate some sort of error
-            if not post_transfer_status[0] & CyI2c.ERROR_BIT:
+            if not post_transfer_status[0] & _I2C_ERROR_BIT:
                 message = "Operation failed with pipe error, but did not detect an I2C comms error?"
                 raise CySerialBridgeError(message) from ex
 
-        if post_transfer_status[0] & CyI2c.ERROR_BIT:
-            partial_transfer_len = struct.unpack("<H", post_transfer_status[1:3])[0]
+        status_flags = post_transfer_status[0]
+        if status_flags & _I2C_ERROR_BIT:
+            partial_transfer_len = _U16_LE_STRUCT.unpack_from(post_transfer_status, 1)[0]
 
             # First reset the write logic
             self._i2c_reset(CyI2c.MODE_WRITE)
 
             # Finally, handle the error
-            if post_transfer_status[0] & CyI2c.ARBITRATION_ERROR_BIT:
-                raise I2CArbLostError
-            elif post_transfer_status[0] & CyI2c.NAK_ERROR_BIT:
-                error = I2CNACKError()
-                error.bytes_written = partial_transfer_len
-                raise error
-            elif post_transfer_status[0] & CyI2c.BUS_ERROR_BIT:
-                raise I2CBusError
-            else:
-                message = "I2C operation failed with status " + repr(post_transfer_status)
-                raise CySerialBridgeError(message)
+            self._raise_i2c_error(post_transfer_status, bytes_written=partial_transfer_len)
+
+        self._last_i2c_status[CyI2c.MODE_WRITE] = status_flags
 
 
 class CySPIMode(Enum):
@@ -924,6 +1275,13 @@ class CySPIMode(Enum):
     NATIONAL_MICROWIRE = (2, 0, 0)
 
 
+# SPI status reported by the bridge once a write has finished
+_SPI_WRITE_DONE_STATUS = bytes(CySpi.GET_STATUS_LEN)
+
+# Lookup table from (protocol enum value, CPHA value, CPOL value) to SPI mode
+_SPI_MODE_BY_VALUE: dict[tuple[int, int, int], CySPIMode] = {mode.value: mode for mode in CySPIMode}
+
+
 @dataclass
 class CySPIConfig:
     # SCLK frequency in Hz.  Must be between 1kHz and 3MHz, inclusive.
@@ -954,8 +1312,17 @@ class CySPIControllerBridge(CySerBridgeBase):
     Driver which uses a Cypress serial bridge in SPI controller (master) mode.
     """
 
+    # Bounds for the interval between status polls while waiting for an SPI write to finish
+    WRITE_DONE_MIN_POLL_INTERVAL = 0.0001  # s
+    WRITE_DONE_MAX_POLL_INTERVAL = 0.001  # s
+
     def __init__(
-        self, context: CyScbContext, discovered_dev: DiscoveredDevice, scb_index: int = 0, timeout: int = 1000
+        self,
+        context: CyScbContext,
+        discovered_dev: DiscoveredDevice,
+        scb_index: int = 0,
+        timeout: int = 1000,
+        skip_handshake: bool = False,
     ):
         """
         Create a CySPIControllerBridge.
@@ -967,11 +1334,21 @@ class CySPIControllerBridge(CySerBridgeBase):
         :param discovered_dev: Discovered device to open (from list_devices())
         :param scb_index: Index of the SCB to open, for multi-port devices
         :param timeout: Timeout to use for general USB operations in milliseconds
+        :param skip_handshake: Reuse the result of a recent handshake with the device, see CySerBridgeBase
         """
-        super().__init__(context, discovered_dev, CyType.SPI, scb_index, timeout)
+        super().__init__(context, discovered_dev, CyType.SPI, scb_index, timeout, skip_handshake)
 
         self._curr_frequency: int | None = None
 
+        # Binary configuration last written by set_spi_configuration(), or None if it's not known to be current
+        self._last_config_bytes: bytes | None = None
+
+        # Request values used for every SPI transfer, computed once up front
+        self._scb_value = self.scb_index << CY_SCB_INDEX_POS
+        self._write_value = self._scb_value | CySpi.WRITE_BIT
+        self._read_value = self._scb_value | CySpi.READ_BIT
+        self._read_write_value = self._write_value | CySpi.READ_BIT
+
     def __enter__(self) -> Self:
         super().__enter__()
 
@@ -980,21 +1357,42 @@ class CySPIControllerBridge(CySerBridgeBase):
 
         return self
 
-    def _compute_timeout(self, transaction_size_bytes: int) -> int:
+    def _compute_timeout(self, transaction_size_bytes: int, frequency: int | None = None) -> int:
         """
         Compute a reasonable timeout for an SPI transaction.
+
+        :param frequency: SPI frequency the transaction will run at.  Defaults to the current frequency.
         """
-        # Assume 9 bit times per byte plus 1 second wiggle room
-        return 1000 + ceil(1000 * transaction_size_bytes * (1 / cast(int, self._curr_frequency)) * 9)
+        if frequency is None:
+            frequency = cast(int, self._curr_frequency)
+
+        # Assume 9 bit times per byte plus 1 second wiggle room.
+        # Integer ceiling division gives the same result as ceil() without going through floats.
+        return 1000 + -(-transaction_size_bytes * 9000 // frequency)
+
+    @staticmethod
+    def _check_transfer_len(transfer_len: int) -> None:
+        """
+        Check that a transfer is short enough to be done in one go.
+
+        Each transfer is always done as a single bulk transfer per direction, but its length has to fit in the
+        setup request.
+        """
+        if transfer_len > CySpi.MAX_TRANSFER_SIZE:
+            message = f"SPI transfer length must be <= {CySpi.MAX_TRANSFER_SIZE}"
+            raise ValueError(message)
 
     def _spi_reset(self) -> None:
         """
         This API resets the SPI module whenever there is an error in a data transaction.
         """
+        # Make sure that the configuration gets written again after a reset
+        self._last_config_bytes = None
+
         self.dev.controlWrite(
             request_type=CY_VENDOR_REQUEST_HOST_TO_DEVICE,
             request=CyVendorCmds.CY_SPI_RESET_CMD,
-            value=self.scb_index << CY_SCB_INDEX_POS,
+            value=self._scb_value,
             index=0,
             data=b"",
             timeout=self.timeout,
@@ -1007,22 +1405,45 @@ class CySPIControllerBridge(CySerBridgeBase):
         spi_status: bytearray = self.dev.controlRead(
             request_type=CY_VENDOR_REQUEST_DEVICE_TO_HOST,
             request=CyVendorCmds.CY_SPI_GET_STATUS_CMD,
-            value=self.scb_index << CY_SCB_INDEX_POS,
+            value=self._scb_value,
             index=0,
             length=CySpi.GET_STATUS_LEN,
             timeout=self.timeout,
         )
 
-        return spi_status == b"\x00\x00\x00\x00"
+        return spi_status == _SPI_WRITE_DONE_STATUS
 
-    def set_spi_configuration(self, config: CySPIConfig) -> None:
+    @staticmethod
+    def _compute_deadline(io_timeout: int) -> float | None:
         """
-        This API configures the SPI module of USB Serial device.
+        Compute the time.monotonic() deadline for a transfer starting now, or None if it has no timeout.
 
-        You should always call this function after first opening the device because the configuration rewriting part of
-        the module does not know how to set the default SPI settings in config and they may be garbage.
+        :param io_timeout: Timeout for the transfer in ms.  0 to wait forever.
+        """
+        return None if io_timeout == 0 else time.monotonic() + io_timeout / 1000
 
-        Note: Using this API during an active transaction of SPI may result in data loss.
+    def _wait_for_write_done(self, deadline: float | None) -> None:
+        """
+        Wait for an SPI write to finish after its data has been sent to the bridge.
+
+        Oddly, unlike I2C, there is no interrupt functionality to tell when the transfer is complete,
+        so we have to poll the status.  The status is checked right away, then polled quickly at first and
+        with backoff after that, so that short writes don't wait for a whole ms.
+
+        :param deadline: Deadline for the transfer from _compute_deadline()
+        """
+        poll_interval = self.WRITE_DONE_MIN_POLL_INTERVAL
+        while not self._spi_is_write_done():
+            if deadline is not None and time.monotonic() > deadline:
+                message = "Timeout waiting for SPI write completion!"
+                raise CySerialBridgeError(message)
+
+            time.sleep(poll_interval)
+            poll_interval = min(poll_interval * 2, self.WRITE_DONE_MAX_POLL_INTERVAL)
+
+    def _pack_spi_configuration(self, config: CySPIConfig) -> bytes:
+        """
+        Check an SPI configuration and convert it to the binary form sent to the device.
         """
         # Check structure
         if config.frequency < CySpi.MIN_FREQUENCY or config.frequency > CySpi.MAX_MASTER_FREQUENCY:
@@ -1032,23 +1453,37 @@ class CySPIControllerBridge(CySerBridgeBase):
             message = "Word size out of valid range"
             raise ValueError(message)
 
-        self._curr_frequency = config.frequency
+        standard, cpha, cpol = config.mode.value
 
-        binary_configuration = struct.pack(
-            CY_USB_SPI_CONFIG_STRUCT_LAYOUT,
+        return _SPI_CONFIG_STRUCT.pack(
             config.frequency,  # frequency
             config.word_size,  # dataWidth
-            config.mode.value[0],  # mode
+            standard,  # mode
             0,  # xferMode (seems unused in Cypress driver)
             config.msbit_first,  # isMsbFirst
             1,  # isMaster (always set to 1 here)
             config.continuous_ssel,  # isContinuous
             config.ti_select_precede,  # isSelectPrecede
-            config.mode.value[1],  # cpha
-            config.mode.value[2],  # cpol
+            cpha,  # cpha
+            cpol,  # cpol
             0,  # isLoopback (seems unused in Cypress driver)
         )
 
+    def set_spi_configuration(self, config: CySPIConfig) -> None:
+        """
+        This API configures the SPI module of USB Serial device.
+
+        You should always call this function after first opening the device because the configuration rewriting part of
+        the module does not know how to set the default SPI settings in config and they may be garbage.
+
+        Note: Using this API during an active transaction of SPI may result in data loss.
+        """
+        binary_configuration = self._pack_spi_configuration(config)
+
+        # Nothing to do if this exact configuration was the last one written
+        if binary_configuration == self._last_config_bytes:
+            return
+
         self.dev.controlWrite(
             request_type=CY_VENDOR_REQUEST_HOST_TO_DEVICE,
             request=CyVendorCmds.CY_SPI_SET_CONFIG_CMD,
@@ -1057,6 +1492,8 @@ class CySPIControllerBridge(CySerBridgeBase):
             data=binary_configuration,
             timeout=self.timeout,
         )
+        self._last_config_bytes = binary_configuration
+        self._curr_frequency = config.frequency
 
     def read_spi_configuration(self) -> CySPIConfig:
         """
@@ -1071,17 +1508,13 @@ class CySPIControllerBridge(CySerBridgeBase):
             timeout=self.timeout,
         )
 
-        config_unpacked = struct.unpack(CY_USB_SPI_CONFIG_STRUCT_LAYOUT, config_bytes)
+        config_unpacked = _SPI_CONFIG_STRUCT.unpack(config_bytes)
 
         # Find the correct mode enum value based on the settings
         standard = config_unpacked[2]
         cpha = config_unpacked[8]
         cpol = config_unpacked[9]
-        spi_mode: CySPIMode | None = None
-        for mode_value in CySPIMode:
-            if mode_value.value == (standard, cpha, cpol):
-                spi_mode = mode_value
-
+        spi_mode = _SPI_MODE_BY_VALUE.get((standard, cpha, cpol))
         if spi_mode is None:
             message = "Invalid SPI mode data read from hardware, can't convert to enum"
             raise CySerialBridgeError(message)
@@ -1111,32 +1544,38 @@ class CySPIControllerBridge(CySerBridgeBase):
             message = "Must call set_spi_configuration() before reading or writing data!"
             raise CySerialBridgeError(message)
 
+        self._check_transfer_len(len(tx_data))
+
         if io_timeout is None:
             io_timeout = self._compute_timeout(len(tx_data))
 
-        # Set up transfer
-        self.dev.controlWrite(
-            request_type=CY_VENDOR_REQUEST_HOST_TO_DEVICE,
-            request=CyVendorCmds.CY_SPI_READ_WRITE_CMD,
-            value=(self.scb_index << CY_SCB_INDEX_POS) | CySpi.WRITE_BIT,
-            index=len(tx_data),
-            data=b"",
+        # Set up transfer.
+        # The data is submitted as soon as the setup request completes, from within libusb's event handling, which
+        # saves returning to the caller between the two.
+        setup_transfer, data_transfer = self._get_transfers(2)
+        setup_transfer.setControl(
+            CY_VENDOR_REQUEST_HOST_TO_DEVICE,
+            CyVendorCmds.CY_SPI_READ_WRITE_CMD,
+            self._write_value,
+            len(tx_data),
+            b"",
             timeout=io_timeout,
         )
+        data_transfer.setBulk(self.ep_out, tx_data, timeout=io_timeout)
 
         # Send data
         try:
-            write_start_time = time.time()
-            self.dev.bulkWrite(self.ep_out, tx_data, timeout=io_timeout)
-
-            # Poll for completion.  Oddly, unlike I2C, there is no interrupt functionality to tell when
-            # the transfer is complete.
-            while not self._spi_is_write_done():
-                time.sleep(0.001)
+            deadline = self._compute_deadline(io_timeout)
+            try:
+                self._submit_and_wait((data_transfer,), setup_transfers=(setup_transfer,))
+            finally:
+                self._release_transfer_buffers((data_transfer,))
+            self._check_transfer_status(setup_transfer)
+            self._check_transfer_status(data_transfer)
 
-                if time.time() > write_start_time + io_timeout:
-                    message = "Timeout waiting for SPI write completion!"
-                    raise CySerialBridgeError(message)
+            # Some of the data may still be waiting to be clocked out after the bulk write returns.  How much depends on
+            # the bridge's internal buffering, so poll for completion (with backoff) rather than guessing a sleep time.
+            self._wait_for_write_done(deadline)
 
         except usb1.USBErrorPipe:
             # Attempt to handle pipe errors similarly to how the original driver did.
@@ -1150,7 +1589,9 @@ class CySPIControllerBridge(CySerBridgeBase):
             self._spi_reset()
             raise
 
-    def spi_read(self, read_len: int, io_timeout: int | None = None) -> ByteSequence:
+    def spi_read(
+        self, read_len: int, io_timeout: int | None = None, out_buf: bytearray | memoryview | None = None
+    ) -> ByteSequence:
         """
         Perform an SPI read-only operation from the peripheral device.
 
@@ -1161,13 +1602,24 @@ class CySPIControllerBridge(CySerBridgeBase):
         :param read_len: Length to read, in words
         :param io_timeout: Timeout for the transfer in ms.  Leave empty to compute a reasonable timeout automatically.
             Set to 0 to wait forever.
+        :param out_buf: Optional writable buffer of exactly read_len bytes to receive the data into.  Callers which
+            read repeatedly can pass the same buffer each time to avoid allocating a new one for every read.
 
-        :return: Bytes read from the device
+        :return: Bytes read from the device (out_buf, if it was given)
         """
         if self._curr_frequency is None:
             message = "Must call set_spi_configuration() before reading or writing data!"
             raise CySerialBridgeError(message)
 
+        # Check the length before allocating anything, so that a bogus length can't cause a huge allocation
+        self._check_transfer_len(read_len)
+
+        if out_buf is None:
+            out_buf = bytearray(read_len)
+        elif len(out_buf) != read_len or memoryview(out_buf).readonly:
+            message = "out_buf must be a writable buffer of length read_len"
+            raise ValueError(message)
+
         if io_timeout is None:
             io_timeout = self._compute_timeout(read_len)
 
@@ -1175,7 +1627,7 @@ class CySPIControllerBridge(CySerBridgeBase):
         self.dev.controlWrite(
             request_type=CY_VENDOR_REQUEST_HOST_TO_DEVICE,
             request=CyVendorCmds.CY_SPI_READ_WRITE_CMD,
-            value=(self.scb_index << CY_SCB_INDEX_POS) | CySpi.READ_BIT,
+            value=self._read_value,
             index=read_len,
             data=b"",
             timeout=io_timeout,
@@ -1188,20 +1640,30 @@ class CySPIControllerBridge(CySerBridgeBase):
             # 64 byte read chunks.  The comments said it was to work around a libusb bug.  No idea
             # if this is still an issue, but for now I decided to KISS by not doing that.
 
-            result: bytearray = self.dev.bulkRead(self.ep_in, read_len, timeout=io_timeout)
-
-            if len(result) != read_len:
-                message = f"Expected {read_len} bytes but only received {len(result)} bytes from bulk read!"
+            # libusb1 receives straight into a writable buffer
+            (transfer,) = self._get_transfers(1)
+            transfer.setBulk(self.ep_in, out_buf, timeout=io_timeout)
+            try:
+                self._submit_and_wait((transfer,))
+            finally:
+                self._release_transfer_buffers((transfer,))
+            self._check_transfer_status(transfer)
+            received_len = transfer.getActualLength()
+
+            if received_len != read_len:
+                message = f"Expected {read_len} bytes but only received {received_len} bytes from bulk read!"
                 raise CySerialBridgeError(message)
 
-            return result
+            return out_buf
 
         except Exception:
             # If anything went wrong, try and reset the SPI module so that the next transaction works
             self._spi_reset()
             raise
 
-    def spi_transfer(self, tx_data: ByteSequence, io_timeout: int | None = None) -> ByteSequence:
+    def spi_transfer(
+        self, tx_data: ByteSequence, io_timeout: int | None = None, out_buf: bytearray | memoryview | None = None
+    ) -> ByteSequence:
         """
         Perform an SPI read-and-write operation to the peripheral device.
 
@@ -1214,54 +1676,115 @@ class CySPIControllerBridge(CySerBridgeBase):
         :param tx_data: Data to write
         :param io_timeout: Timeout for the transfer in ms.  Leave empty to compute a reasonable timeout automatically.
             Set to 0 to wait forever.
+        :param out_buf: Optional writable buffer of the same length as tx_data to receive the data into.  Any object
+            supporting the buffer protocol works, e.g. memoryview(numpy_array).cast("B") to receive straight into an
+            array.
+
+        :return: Bytes read from the device (out_buf, if it was given)
         """
         if self._curr_frequency is None:
             message = "Must call set_spi_configuration() before reading or writing data!"
             raise CySerialBridgeError(message)
 
+        return self._spi_transfer(tx_data, io_timeout, out_buf, None, self._curr_frequency)
+
+    def set_config_and_transfer(
+        self,
+        config: CySPIConfig,
+        tx_data: ByteSequence,
+        io_timeout: int | None = None,
+        out_buf: bytearray | memoryview | None = None,
+    ) -> ByteSequence:
+        """
+        Apply an SPI configuration, then perform an SPI read-and-write operation with it.
+
+        This is equivalent to calling set_spi_configuration() and then spi_transfer(), but the configuration
+        request is queued together with the transfer, which saves a USB round trip when the configuration changes
+        (e.g. when switching between devices with different SPI modes on one bus).
+
+        :param config: Configuration to apply
+        :param tx_data: Data to write
+        :param io_timeout: Timeout for the transfer in ms.  Leave empty to compute a reasonable timeout automatically.
+            Set to 0 to wait forever.
+        :param out_buf: Optional writable buffer of the same length as tx_data to receive the data into.
+
+        :return: Bytes read from the device (out_buf, if it was given)
+        """
+        binary_configuration = self._pack_spi_configuration(config)
+        if binary_configuration == self._last_config_bytes:
+            binary_configuration = None
+
+        return self._spi_transfer(tx_data, io_timeout, out_buf, binary_configuration, config.frequency)
+
+    def _spi_transfer(
+        self,
+        tx_data: ByteSequence,
+        io_timeout: int | None,
+        out_buf: bytearray | memoryview | None,
+        binary_configuration: bytes | None,
+        frequency: int,
+    ) -> ByteSequence:
+        """
+        Implementation of spi_transfer() and set_config_and_transfer().
+
+        :param binary_configuration: If not None, configuration to write to the device before the transfer
+        :param frequency: SPI frequency the transfer will run at.  Becomes the current frequency once
+            binary_configuration has been written.
+        """
+        if out_buf is None:
+            out_buf = bytearray(len(tx_data))
+        elif len(out_buf) != len(tx_data) or memoryview(out_buf).readonly:
+            message = "out_buf must be a writable buffer of the same length as tx_data"
+            raise ValueError(message)
+
+        self._check_transfer_len(len(tx_data))
+
         if io_timeout is None:
-            io_timeout = self._compute_timeout(len(tx_data))
+            io_timeout = self._compute_timeout(len(tx_data), frequency)
 
-        # Set up transfer
-        self.dev.controlWrite(
-            request_type=CY_VENDOR_REQUEST_HOST_TO_DEVICE,
-            request=CyVendorCmds.CY_SPI_READ_WRITE_CMD,
-            value=(self.scb_index << CY_SCB_INDEX_POS) | CySpi.WRITE_BIT | CySpi.READ_BIT,
-            index=len(tx_data),
-            data=b"",
-            timeout=io_timeout,
-        )
+        # Send the setup request, then send and receive data at the same time using async API.
+        # The data transfers are submitted as soon as the setup request completes, from within libusb's event
+        # handling, which saves returning to the caller between the two.
+        pooled_transfers = self._get_transfers(3 if binary_configuration is None else 4)
+        setup_transfer, tx_transfer, rx_transfer = pooled_transfers[:3]
+        config_transfers = pooled_transfers[3:]
 
-        try:
-            # Send and receive data at the same time using async API
-            tx_transfer = self.dev.getTransfer()
-            rx_transfer = self.dev.getTransfer()
+        all_transfers = (*config_transfers, setup_transfer, tx_transfer, rx_transfer)
 
+        try:
+            if binary_configuration is not None:
+                # Control requests are handled in order, so the new configuration is in effect before the transfer
+                config_transfers[0].setControl(
+                    CY_VENDOR_REQUEST_HOST_TO_DEVICE,
+                    CyVendorCmds.CY_SPI_SET_CONFIG_CMD,
+                    self._scb_value,
+                    0,
+                    binary_configuration,
+                    timeout=self.timeout,
+                )
+            setup_transfer.setControl(
+                CY_VENDOR_REQUEST_HOST_TO_DEVICE,
+                CyVendorCmds.CY_SPI_READ_WRITE_CMD,
+                self._read_write_value,
+                len(tx_data),
+                b"",
+                timeout=io_timeout,
+            )
+            # libusb1 uses writable buffers in place, so this receives straight into out_buf
             tx_transfer.setBulk(self.ep_out, tx_data, timeout=io_timeout)
-            rx_transfer.setBulk(self.ep_in, len(tx_data), timeout=io_timeout)
-
-            tx_transfer.submit()
-            rx_transfer.submit()
-
-            start_time = time.time()
-
-            # Wait for both transfers to finish, polling libusb until they are.
-            while tx_transfer.isSubmitted() or rx_transfer.isSubmitted():
-                with contextlib.suppress(
-                    usb1.USBErrorInterrupted
-                ):  # Suppressing this exception is recommended by the python-libusb1 docs
-                    # Note: the best way to do this is to use libusb_handle_events_completed(),
-                    # which allows handling events until a specific transfer is completed.
-                    # That would allow us to cleanly block until the transfers are done.
-                    # However, python-libusb1 currently doesn't provide an abstraction for that
-                    # function.  Sadness.  So, we have to just keep polling instead.
-                    # This is will work OK, but only as long as libusb is not used from another
-                    # thread at the same time.
-                    # Reference: https://libusb.sourceforge.io/api-1.0/libusb_mtasync.html#Using
-                    self.context.usb_context.handleEvents()
+            rx_transfer.setBulk(self.ep_in, out_buf, timeout=io_timeout)
+
+            deadline = self._compute_deadline(io_timeout)
+            self._submit_and_wait((tx_transfer, rx_transfer), setup_transfers=(*config_transfers, setup_transfer))
+
+            for control_transfer in (*config_transfers, setup_transfer):
+                self._check_transfer_status(control_transfer)
+            if binary_configuration is not None:
+                self._last_config_bytes = binary_configuration
+                self._curr_frequency = frequency
 
-                if (time.time() - start_time) > io_timeout:
-                    raise usb1.USBErrorTimeout
+            if usb1.TRANSFER_TIMED_OUT in (tx_transfer.getStatus(), rx_transfer.getStatus()):
+                raise usb1.USBErrorTimeout
 
             if tx_transfer.getStatus() == usb1.TRANSFER_STALL:
                 # Attempt to handle pipe errors similarly to how the original driver did.
@@ -1279,18 +1802,16 @@ class CySPIControllerBridge(CySerBridgeBase):
                 message = f"Expected {len(tx_data)} bytes but only received {rx_transfer.getActualLength()} bytes from bulk read!"
                 raise CySerialBridgeError(message)
 
-            # Poll for write completion.  Oddly, unlike I2C, there is no interrupt functionality to tell when
-            # the transfer is complete.
-            while not self._spi_is_write_done():
-                time.sleep(0.001)
+            # All the data has been clocked in by now, so the write is almost always finished already
+            self._wait_for_write_done(deadline)
 
-                if time.time() > start_time + io_timeout:
-                    message = "Timeout waiting for SPI write completion!"
-                    raise CySerialBridgeError(message)
-
-            return cast(ByteSequence, rx_transfer.getBuffer())
+            return out_buf
 
         except Exception:
             # If anything went wrong, try and reset the SPI module so that the next transaction works
+            self._cancel_transfers(all_transfers)
             self._spi_reset()
             raise
+
+        finally:
+            self._release_transfer_buffers((tx_transfer, rx_transfer))
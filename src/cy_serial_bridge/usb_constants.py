@@ -147,6 +147,9 @@ class CyI2c(IntEnum):
     EVENT_NOTIFICATION_LEN = 3
     MAX_VALID_ADDRESS = 0x7F
 
+    # The transfer length is sent in the 16-bit wIndex field of the setup request
+    MAX_TRANSFER_SIZE = 0xFFFF
+
     MIN_FREQUENCY = 1000
     MAX_FREQUENCY = 400000
 
@@ -166,6 +169,9 @@ class CySpi(IntEnum):
     MIN_WORD_SIZE = 4
     MAX_WORD_SIZE = 16
 
+    # The transfer length is sent in the 16-bit wIndex field of the setup request
+    MAX_TRANSFER_SIZE = 0xFFFF
+
 
 # Vendor UART related macros
 class CyUart(IntEnum):
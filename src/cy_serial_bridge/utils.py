@@ -30,7 +30,7 @@ class CySerialBridgeError(Exception):
     pass
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class DiscoveredDevice:
     """
     Represents one detected device on the system
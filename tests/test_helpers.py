@@ -0,0 +1,654 @@
+from __future__ import annotations
+
+import math
+import os
+import pathlib
+from fractions import Fraction
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+import usb1
+
+import cy_serial_bridge
+from cy_serial_bridge import CyI2c, CyI2CControllerBridge, CySPIConfig, CySPIControllerBridge, CySPIMode, CyType
+from cy_serial_bridge import cy_scb_context
+from cy_serial_bridge.cy_scb_context import CyScbContext, _filter_and_describe, _vid_pid_filter
+from cy_serial_bridge.driver import _I2C_ERROR_BIT, _SPI_MODE_BY_VALUE, CySerBridgeBase
+from cy_serial_bridge.utils import DiscoveredDevice
+
+"""
+Test suite for the pure helper functions of the driver.
+Unlike test_driver.py, these tests do not need any hardware.  USB objects are replaced with minimal fakes
+providing only the methods the helpers use.
+"""
+
+
+class FakeEndpoint:
+    def __init__(self, address: int, transfer_type: int):
+        self.address = address
+        self.transfer_type = transfer_type
+
+    def getAddress(self) -> int:  # noqa: N802
+        return self.address
+
+    def getAttributes(self) -> int:  # noqa: N802
+        return self.transfer_type
+
+
+class FakeInterfaceSetting:
+    def __init__(self, intf_class: int, intf_subclass: int, endpoints: list[FakeEndpoint]):
+        self.intf_class = intf_class
+        self.intf_subclass = intf_subclass
+        self.endpoints = endpoints
+
+    def getClass(self) -> int:  # noqa: N802
+        return self.intf_class
+
+    def getSubClass(self) -> int:  # noqa: N802
+        return self.intf_subclass
+
+    def getNumEndpoints(self) -> int:  # noqa: N802
+        return len(self.endpoints)
+
+    def __iter__(self) -> Any:
+        return iter(self.endpoints)
+
+
+class FakeConfiguration:
+    def __init__(self, interfaces: list[list[FakeInterfaceSetting]]):
+        self.interfaces = interfaces
+
+    def getNumInterfaces(self) -> int:  # noqa: N802
+        return len(self.interfaces)
+
+    def __getitem__(self, index: int) -> list[FakeInterfaceSetting]:
+        return self.interfaces[index]
+
+
+class FakeDeviceHandle:
+    def __init__(self, device: FakeDevice):
+        self.device = device
+
+    def getASCIIStringDescriptor(self, index: int) -> str:  # noqa: N802
+        self.device.string_reads.append(index)
+        return f"string {index}"
+
+    def getSerialNumber(self) -> str | None:  # noqa: N802
+        return self.device.serial_number
+
+    def close(self) -> None:
+        pass
+
+
+class FakeDevice:
+    def __init__(
+        self,
+        vid: int,
+        pid: int,
+        configurations: list[FakeConfiguration],
+        address: int = 1,
+        port_numbers: list[int] | None = None,
+        serial_number: str | None = None,
+        string_reads: list[int] | None = None,
+    ):
+        self.vid = vid
+        self.pid = pid
+        self.configurations = configurations
+        self.address = address
+        self.port_numbers = [] if port_numbers is None else port_numbers
+        self.serial_number = serial_number
+        self.num_opens = 0
+
+        # String descriptor indexes read from this device.  May be shared between devices.
+        self.string_reads = [] if string_reads is None else string_reads
+
+    def getBusNumber(self) -> int:  # noqa: N802
+        return 1
+
+    def getDeviceAddress(self) -> int:  # noqa: N802
+        return self.address
+
+    def getPortNumberList(self) -> list[int]:  # noqa: N802
+        return self.port_numbers
+
+    def getManufacturerDescriptor(self) -> int:  # noqa: N802
+        return 1
+
+    def getProductDescriptor(self) -> int:  # noqa: N802
+        return 2
+
+    def open(self) -> FakeDeviceHandle:
+        self.num_opens += 1
+        return FakeDeviceHandle(self)
+
+    def getVendorID(self) -> int:  # noqa: N802
+        return self.vid
+
+    def getProductID(self) -> int:  # noqa: N802
+        return self.pid
+
+    def getNumConfigurations(self) -> int:  # noqa: N802
+        return len(self.configurations)
+
+    def __len__(self) -> int:
+        return len(self.configurations)
+
+    def __getitem__(self, index: int) -> FakeConfiguration:
+        return self.configurations[index]
+
+
+def scb_interface(subclass: int, bulk_out: int = 0x01, bulk_in: int = 0x82, int_in: int = 0x83) -> list[Any]:
+    return [
+        FakeInterfaceSetting(
+            cy_serial_bridge.USBClass.VENDOR,
+            subclass,
+            [FakeEndpoint(bulk_out, 2), FakeEndpoint(bulk_in, 2), FakeEndpoint(int_in, 3)],
+        )
+    ]
+
+
+def mfg_interface() -> list[Any]:
+    return [FakeInterfaceSetting(cy_serial_bridge.USBClass.VENDOR, CyType.MFG, [])]
+
+
+def test_normalize_pids():
+    """
+    Test that a pids argument is always turned into a new set
+    """
+    assert CyScbContext._normalize_pids(0x0004) == {0x0004}
+
+    pids = {0x0004, 0x0005}
+    normalized = CyScbContext._normalize_pids(pids)
+    assert normalized == pids
+    assert normalized is not pids
+
+    # Changing the result must not change the caller's set
+    normalized.add(0x0006)
+    assert pids == {0x0004, 0x0005}
+
+
+def test_vid_pid_filter():
+    """
+    Test building the VID/PID filter for list_devices()
+    """
+    assert _vid_pid_filter(0x04B4, frozenset({0x0004, 0x000A})) == {(0x04B4, 0x0004), (0x04B4, 0x000A)}
+    assert _vid_pid_filter(0x04B4, frozenset()) == frozenset()
+
+
+@pytest.mark.parametrize(
+    ("subclass", "expected_type"),
+    [(CyType.UART_VENDOR, CyType.UART_VENDOR), (CyType.SPI, CyType.SPI), (CyType.I2C, CyType.I2C)],
+)
+def test_identify_scb_interface(subclass: int, expected_type: CyType):
+    """
+    Test that SCB interfaces are identified from their subclass and endpoint layout
+    """
+    # Both the SCB0 and SCB1 endpoint layouts should be accepted
+    assert CyScbContext.identify_interface(scb_interface(subclass)) == expected_type
+    assert (
+        CyScbContext.identify_interface(scb_interface(subclass, bulk_out=0x04, bulk_in=0x85, int_in=0x86))
+        == expected_type
+    )
+
+
+def test_identify_interface_bad_endpoints():
+    """
+    Test that interfaces with the right class but the wrong endpoints are rejected
+    """
+    # Wrong endpoint address
+    assert CyScbContext.identify_interface(scb_interface(CyType.SPI, bulk_out=0x02)) is None
+
+    # Interrupt endpoint where a bulk one should be
+    bad_setting = scb_interface(CyType.SPI)
+    bad_setting[0].endpoints[1] = FakeEndpoint(0x82, 3)
+    assert CyScbContext.identify_interface(bad_setting) is None
+
+    # Missing endpoint
+    bad_setting = scb_interface(CyType.SPI)
+    del bad_setting[0].endpoints[2]
+    assert CyScbContext.identify_interface(bad_setting) is None
+
+    # Unknown subclass
+    assert CyScbContext.identify_interface(scb_interface(0x42)) is None
+
+    # Manufacturer interface must not have endpoints
+    assert CyScbContext.identify_interface(mfg_interface()) == CyType.MFG
+    assert CyScbContext.identify_interface(scb_interface(CyType.MFG)) is None
+
+
+def test_filter_and_describe():
+    """
+    Test the VID/PID filtering and interface layout checks done while listing devices
+    """
+    vid_pids = {(0x04B4, 0x0004)}
+    valid_vids = {0x04B4}
+    config = FakeConfiguration([scb_interface(CyType.SPI), mfg_interface()])
+
+    discovered = _filter_and_describe(FakeDevice(0x04B4, 0x0004, [config]), vid_pids, valid_vids)
+    assert discovered is not None
+    assert discovered.vid == 0x04B4
+    assert discovered.pid == 0x0004
+    assert discovered.scb_interface_settings is config[0][0]
+    assert discovered.mfg_interface_settings is config[1][0]
+    assert not discovered.open_failed
+
+    # Odd PIDs (used in UART CDC mode) match the even PID in the filter
+    assert _filter_and_describe(FakeDevice(0x04B4, 0x0005, [config]), vid_pids, valid_vids) is not None
+
+    # Other VIDs and PIDs are rejected, unless there is no filter
+    assert _filter_and_describe(FakeDevice(0x1234, 0x0004, [config]), vid_pids, valid_vids) is None
+    assert _filter_and_describe(FakeDevice(0x04B4, 0x0006, [config]), vid_pids, valid_vids) is None
+    assert _filter_and_describe(FakeDevice(0x1234, 0x0006, [config]), None, None) is not None
+
+    # Devices without a manufacturer interface, or with the wrong number of configurations, are rejected
+    no_mfg_config = FakeConfiguration([scb_interface(CyType.SPI), scb_interface(CyType.I2C)])
+    assert _filter_and_describe(FakeDevice(0x04B4, 0x0004, [no_mfg_config]), vid_pids, valid_vids) is None
+    assert _filter_and_describe(FakeDevice(0x04B4, 0x0004, [config, config]), vid_pids, valid_vids) is None
+    assert _filter_and_describe(FakeDevice(0x04B4, 0x0004, []), vid_pids, valid_vids) is None
+
+
+@pytest.mark.parametrize("frequency", [1000, 100000, 400000, 1000000, 3000000, 12000000])
+def test_compute_timeout(frequency: int):
+    """
+    Test that the integer timeout calculations give exactly the rounded-up timeout
+    """
+    i2c_bridge = CyI2CControllerBridge.__new__(CyI2CControllerBridge)
+    i2c_bridge._curr_frequency = frequency
+    spi_bridge = CySPIControllerBridge.__new__(CySPIControllerBridge)
+    spi_bridge._curr_frequency = frequency
+
+    for size in [*range(600), 4096, 65535]:
+        i2c_timeout = i2c_bridge._compute_timeout(size)
+        spi_timeout = spi_bridge._compute_timeout(size)
+        assert i2c_timeout == 1000 + math.ceil(Fraction(size * 10000, frequency))
+        assert spi_timeout == 1000 + math.ceil(Fraction(size * 9000, frequency))
+
+        # The old float calculation could only come out higher, when a rounding error pushed it past an integer
+        assert 0 <= 1000 + math.ceil(1000 * size * (1 / frequency) * 10) - i2c_timeout <= 1
+        assert 0 <= 1000 + math.ceil(1000 * size * (1 / frequency) * 9) - spi_timeout <= 1
+
+    # An explicit frequency overrides the current one
+    assert spi_bridge._compute_timeout(1000, frequency=1000000) == 1009
+
+
+def test_spi_mode_round_trip():
+    """
+    Test that every SPI mode survives being packed into a configuration and read back
+    """
+    for mode in CySPIMode:
+        assert _SPI_MODE_BY_VALUE[mode.value] is mode
+
+    class FakeConfigDevice:
+        config_bytes = b""
+
+        def controlRead(self, **kwargs: Any) -> bytes:  # noqa: N802
+            return self.config_bytes
+
+    bridge = CySPIControllerBridge.__new__(CySPIControllerBridge)
+    bridge.scb_index = 0
+    bridge.timeout = 1000
+    bridge.dev = FakeConfigDevice()
+
+    for mode in CySPIMode:
+        config = CySPIConfig(
+            frequency=2000000, word_size=16, mode=mode, msbit_first=False, continuous_ssel=True, ti_select_precede=False
+        )
+        bridge.dev.config_bytes = bridge._pack_spi_configuration(config)
+        assert bridge.read_spi_configuration() == config
+
+
+def test_spi_transfer_length_checks():
+    """
+    Test that SPI transfers which are too long, or have an unusable out_buf, are rejected before any USB traffic
+    """
+    CySPIControllerBridge._check_transfer_len(cy_serial_bridge.CySpi.MAX_TRANSFER_SIZE)
+    with pytest.raises(ValueError, match="SPI transfer length"):
+        CySPIControllerBridge._check_transfer_len(cy_serial_bridge.CySpi.MAX_TRANSFER_SIZE + 1)
+
+    # No USB device at all, so any attempt to talk to one would fail with a different error
+    bridge = CySPIControllerBridge.__new__(CySPIControllerBridge)
+    bridge._curr_frequency = 1000000
+    bridge.dev = None
+
+    with pytest.raises(ValueError, match="SPI transfer length"):
+        bridge.spi_transfer(bytes(cy_serial_bridge.CySpi.MAX_TRANSFER_SIZE + 1))
+    with pytest.raises(ValueError, match="out_buf"):
+        bridge.spi_transfer(b"\x01\x02\x03\x04", out_buf=bytearray(3))
+    with pytest.raises(ValueError, match="out_buf"):
+        bridge.spi_transfer(b"\x01\x02\x03\x04", out_buf=memoryview(bytes(4)))
+    with pytest.raises(ValueError, match="SPI transfer length"):
+        bridge.spi_read(cy_serial_bridge.CySpi.MAX_TRANSFER_SIZE + 1)
+    with pytest.raises(ValueError, match="out_buf"):
+        bridge.spi_read(4, out_buf=bytearray(5))
+    with pytest.raises(ValueError, match="out_buf"):
+        bridge.spi_read(4, out_buf=memoryview(bytes(4)))
+
+
+class FakeUsbContext:
+    """
+    Stands in for a libusb context.  Each call to handleEvents() completes the oldest submitted transfer.
+    """
+
+    def __init__(self, devices: list[FakeDevice] | None = None):
+        self.devices = [] if devices is None else devices
+        self.pending: list[FakeTransfer] = []
+        self.events: list[tuple[str, str]] = []
+        self.max_in_flight = 0
+
+        # Control transfers with these wValues fail with a stall
+        self.stall_values: set[int] = set()
+
+    def getDeviceList(self, skip_on_error: bool = False) -> list[FakeDevice]:  # noqa: N802
+        return self.devices
+
+    def submit(self, transfer: FakeTransfer) -> None:
+        self.pending.append(transfer)
+        self.max_in_flight = max(self.max_in_flight, len(self.pending))
+        self.events.append(("submit", transfer.name))
+
+    def handleEvents(self) -> None:  # noqa: N802
+        transfer = self.pending.pop(0)
+        transfer.submitted = False
+        transfer.status = transfer.result_status
+        self.events.append(("complete", transfer.name))
+        if transfer.callback is not None:
+            transfer.callback(transfer)
+
+
+class FakeTransfer:
+    def __init__(self, usb_context: FakeUsbContext, name: str = "", result_status: int = usb1.TRANSFER_COMPLETED):
+        self.usb_context = usb_context
+        self.name = name
+        self.result_status = result_status
+        self.submitted = False
+        self.callback: Any = None
+        self.user_data: Any = None
+        self.buffer = b""
+
+        # Status left over from a previous use of the transfer
+        self.status = usb1.TRANSFER_COMPLETED
+
+    def setCallback(self, callback: Any) -> None:  # noqa: N802
+        self.callback = callback
+
+    def setControl(  # noqa: N802
+        self,
+        request_type: int,
+        request: int,
+        value: int,
+        index: int,
+        data_or_length: Any,
+        callback: Any = None,
+        user_data: Any = None,
+        timeout: int = 0,
+    ) -> None:
+        self.name = f"control {value}"
+        self.callback = callback
+        self.user_data = user_data
+        self.result_status = usb1.TRANSFER_STALL if value in self.usb_context.stall_values else usb1.TRANSFER_COMPLETED
+
+        # Reads return the wValue of the request, repeated
+        self.buffer = bytes([value]) * data_or_length if isinstance(data_or_length, int) else bytes(data_or_length)
+
+    def submit(self) -> None:
+        assert not self.submitted
+        self.submitted = True
+        self.usb_context.submit(self)
+
+    def cancel(self) -> None:
+        if not self.submitted:
+            raise usb1.USBErrorNotFound
+        self.result_status = usb1.TRANSFER_CANCELLED
+
+    def isSubmitted(self) -> bool:  # noqa: N802
+        return self.submitted
+
+    def getStatus(self) -> int:  # noqa: N802
+        return self.status
+
+    def getUserData(self) -> Any:  # noqa: N802
+        return self.user_data
+
+    def getBuffer(self) -> bytes:  # noqa: N802
+        return self.buffer
+
+    def getActualLength(self) -> int:  # noqa: N802
+        return len(self.buffer)
+
+
+def make_async_bridge(usb_context: FakeUsbContext) -> CySerBridgeBase:
+    bridge = CySerBridgeBase.__new__(CySerBridgeBase)
+    bridge.context = SimpleNamespace(usb_context=usb_context)
+    bridge.dev = None
+    bridge._transfer_pool = [FakeTransfer(usb_context) for _ in range(CySerBridgeBase.CONTROL_QUEUE_DEPTH)]
+    return bridge
+
+
+def test_submit_and_wait_ordering():
+    """
+    Test that data transfers are only submitted once their setup transfer has completed
+    """
+    usb_context = FakeUsbContext()
+    bridge = make_async_bridge(usb_context)
+    setup = FakeTransfer(usb_context, "setup")
+    data = FakeTransfer(usb_context, "data")
+    event = FakeTransfer(usb_context, "event")
+
+    bridge._submit_and_wait((data, event), setup_transfers=(setup,))
+    assert usb_context.events == [
+        ("submit", "setup"),
+        ("complete", "setup"),
+        ("submit", "data"),
+        ("submit", "event"),
+        ("complete", "data"),
+        ("complete", "event"),
+    ]
+    assert setup.callback is None
+
+    # Without setup transfers, everything is submitted straight away
+    usb_context.events.clear()
+    bridge._submit_and_wait((data, event))
+    assert usb_context.events == [("submit", "data"), ("submit", "event"), ("complete", "data"), ("complete", "event")]
+
+
+def test_submit_and_wait_failures():
+    """
+    Test that a failed setup transfer stops the data transfers from being submitted, and that a failed data
+    transfer gets the others cancelled
+    """
+    usb_context = FakeUsbContext()
+    bridge = make_async_bridge(usb_context)
+    setup = FakeTransfer(usb_context, "setup", usb1.TRANSFER_STALL)
+    data = FakeTransfer(usb_context, "data")
+
+    bridge._submit_and_wait((data,), setup_transfers=(setup,))
+    assert usb_context.events == [("submit", "setup"), ("complete", "setup")]
+    assert setup.getStatus() == usb1.TRANSFER_STALL
+
+    usb_context.events.clear()
+    data = FakeTransfer(usb_context, "data", usb1.TRANSFER_TIMED_OUT)
+    event = FakeTransfer(usb_context, "event")
+    bridge._submit_and_wait((data, event))
+    assert not event.isSubmitted()
+    assert event.getStatus() == usb1.TRANSFER_CANCELLED
+
+    # The error of the transfer which actually failed is reported, not the cancellation
+    with pytest.raises(usb1.USBErrorTimeout):
+        bridge._check_transfer_statuses((event, data))
+
+
+def test_control_transfer_batch():
+    """
+    Test that batched control transfers are submitted in order, with a limited queue depth, and return their data
+    """
+    usb_context = FakeUsbContext()
+    bridge = make_async_bridge(usb_context)
+
+    requests = [(0x40, 0xE0, value, 0, 2 if value % 2 else b"\x00") for value in range(10)]
+    results = bridge._control_transfer_batch(requests, timeout=1000)
+    assert results == [bytes([value]) * 2 if value % 2 else b"" for value in range(10)]
+    submitted_names = [name for kind, name in usb_context.events if kind == "submit"]
+    assert submitted_names == [f"control {value}" for value in range(10)]
+    assert usb_context.max_in_flight == CySerBridgeBase.CONTROL_QUEUE_DEPTH
+
+    # A failed transfer raises, and nothing is left in flight
+    usb_context.events.clear()
+    usb_context.stall_values = {5}
+    with pytest.raises(usb1.USBErrorPipe):
+        bridge._control_transfer_batch(requests, timeout=1000)
+    assert len(usb_context.pending) == 0
+    assert ("submit", "control 9") not in usb_context.events
+
+
+def test_list_devices_cache():
+    """
+    Test that list_devices() reuses the result of a very recent identical scan, and hands out copies of it
+    """
+    string_reads: list[int] = []
+    config = FakeConfiguration([scb_interface(CyType.SPI), mfg_interface()])
+    devices = [
+        FakeDevice(0x04B4, 0x0004, [config], address=5, serial_number="A", string_reads=string_reads),
+        FakeDevice(0x04B4, 0x0004, [config], address=6, serial_number="B", string_reads=string_reads),
+    ]
+    context = CyScbContext()
+    context._usb_context = FakeUsbContext(devices)
+    vid_pids = {(0x04B4, 0x0004)}
+
+    def num_opens() -> int:
+        return sum(device.num_opens for device in devices)
+
+    first = context.list_devices(vid_pids)
+    assert [(entry.serial_number, entry.manufacturer_str, entry.product_str) for entry in first] == [
+        ("A", "string 1", "string 2"),
+        ("B", "string 1", "string 2"),
+    ]
+    assert num_opens() == 2
+
+    # Manufacturer and product strings are only read from the first device of a model
+    assert sorted(string_reads) == [1, 2]
+
+    second = context.list_devices(vid_pids)
+    assert num_opens() == 2
+    assert second == first
+    assert all(second_entry is not first_entry for second_entry, first_entry in zip(second, first))
+
+    # Changing a returned entry must not change the cache
+    second[0].serial_number = "changed"
+    assert context.list_devices(vid_pids)[0].serial_number == "A"
+    assert num_opens() == 2
+
+    # Different arguments, a re-enumerated device, or an expired entry all cause a rescan
+    context.list_devices(vid_pids, need_strings=False)
+    assert num_opens() == 4
+
+    devices[1].address = 7
+    context.list_devices(vid_pids, need_strings=False)
+    assert num_opens() == 6
+
+    scan_time, cache_key, cached_devices = context._list_cache
+    context._list_cache = (scan_time - CyScbContext.LIST_CACHE_TTL, cache_key, cached_devices)
+    context.list_devices(vid_pids, need_strings=False)
+    assert num_opens() == 8
+
+
+def test_read_strings_from_sysfs(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+    """
+    Test reading string descriptors from (a fake) sysfs, and falling back to libusb when that is not possible
+    """
+    opened_nodes: list[str] = []
+    open_error: list[OSError] = []
+
+    def fake_open(path: str, flags: int) -> int:
+        opened_nodes.append(path)
+        if len(open_error) > 0:
+            raise open_error[0]
+        return -1
+
+    monkeypatch.setattr(cy_scb_context, "pathlib", SimpleNamespace(Path=lambda _: tmp_path))
+    monkeypatch.setattr(cy_scb_context, "os", SimpleNamespace(open=fake_open, close=lambda _: None, O_RDWR=os.O_RDWR))
+
+    config = FakeConfiguration([scb_interface(CyType.SPI), mfg_interface()])
+
+    def make_entry(port_numbers: list[int]) -> DiscoveredDevice:
+        device = FakeDevice(0x04B4, 0x0004, [config], address=5, port_numbers=port_numbers)
+        entry = _filter_and_describe(device, None, None)
+        assert entry is not None
+        return entry
+
+    sysfs_dir = tmp_path / "1-2.3"
+    sysfs_dir.mkdir()
+    (sysfs_dir / "devnum").write_text("5\n")
+    (sysfs_dir / "manufacturer").write_text("Cypress Semiconductor\n")
+    (sysfs_dir / "product").write_text("USB-Serial (Dual Channel)\n")
+
+    # Missing attributes mean the device has no such string
+    entry = make_entry([2, 3])
+    assert CyScbContext._read_strings_from_sysfs(entry)
+    assert opened_nodes == ["/dev/bus/usb/001/005"]
+    assert entry.manufacturer_str == "Cypress Semiconductor"
+    assert entry.product_str == "USB-Serial (Dual Channel)"
+    assert entry.serial_number is None
+    assert not entry.open_failed
+
+    # Device node which we don't have permission to open
+    open_error.append(PermissionError())
+    entry = make_entry([2, 3])
+    assert CyScbContext._read_strings_from_sysfs(entry)
+    assert entry.open_failed
+    assert entry.manufacturer_str is None
+
+    # Device node which went away
+    open_error[0] = FileNotFoundError()
+    entry = make_entry([2, 3])
+    assert not CyScbContext._read_strings_from_sysfs(entry)
+    assert not entry.open_failed
+
+    # Stale sysfs entry, no sysfs entry, or no port numbers to find the sysfs entry with
+    open_error.clear()
+    (sysfs_dir / "devnum").write_text("7\n")
+    assert not CyScbContext._read_strings_from_sysfs(make_entry([2, 3]))
+    assert not CyScbContext._read_strings_from_sysfs(make_entry([4]))
+    assert not CyScbContext._read_strings_from_sysfs(make_entry([]))
+
+
+def test_i2c_status_tracking():
+    """
+    Test that the I2C error check uses the status left over from the last transfer, and only queries the chip
+    when there is none
+    """
+
+    class FakeI2cDevice:
+        def __init__(self) -> None:
+            self.status_flags = 0
+            self.status_reads: list[int] = []
+            self.resets: list[int] = []
+
+        def controlRead(self, value: int, **kwargs: Any) -> bytes:  # noqa: N802
+            self.status_reads.append(value)
+            return bytes([self.status_flags, 0, 0, 0])
+
+        def controlWrite(self, value: int, **kwargs: Any) -> None:  # noqa: N802
+            self.resets.append(value)
+
+    bridge = CyI2CControllerBridge.__new__(CyI2CControllerBridge)
+    bridge._scb_high = 0
+    bridge.timeout = 1000
+    bridge.dev = FakeI2cDevice()
+    bridge._last_i2c_status = {CyI2c.MODE_READ: 0, CyI2c.MODE_WRITE: _I2C_ERROR_BIT}
+
+    assert not bridge._i2c_has_error(CyI2c.MODE_READ)
+    assert bridge._i2c_has_error(CyI2c.MODE_WRITE)
+    assert bridge.dev.status_reads == []
+
+    # Resetting a module forgets its status, so the next check has to ask the chip
+    bridge._i2c_reset(CyI2c.MODE_WRITE)
+    assert bridge.dev.resets == [CyI2c.MODE_WRITE]
+    assert bridge._last_i2c_status[CyI2c.MODE_WRITE] is None
+    assert not bridge._i2c_has_error(CyI2c.MODE_WRITE)
+    assert bridge.dev.status_reads == [CyI2c.MODE_WRITE]
+
+    bridge._last_i2c_status[CyI2c.MODE_READ] = None
+    bridge.dev.status_flags = _I2C_ERROR_BIT
+    assert bridge._i2c_has_error(CyI2c.MODE_READ)
+    assert bridge.dev.status_reads == [CyI2c.MODE_WRITE, CyI2c.MODE_READ]